@@ -36,14 +36,10 @@ import venv
 ROOT = Path(__file__).parent.resolve()
 VENV_DIR = ROOT / ".venv"
 IS_WINDOWS = os.name == "nt"
-
-
-def venv_python() -> Path:
-    return VENV_DIR / ("Scripts" if IS_WINDOWS else "bin") / ("python.exe" if IS_WINDOWS else "python")
-
-
-def venv_pip() -> Path:
-    return VENV_DIR / ("Scripts" if IS_WINDOWS else "bin") / ("pip.exe" if IS_WINDOWS else "pip")
+# Paths inside the venv, computed once and kept as strings for subprocess calls
+VENV_BIN = str(VENV_DIR / ("Scripts" if IS_WINDOWS else "bin"))
+VENV_PYTHON = os.path.join(VENV_BIN, "python.exe" if IS_WINDOWS else "python")
+VENV_PIP = os.path.join(VENV_BIN, "pip.exe" if IS_WINDOWS else "pip")
 
 
 def ensure_venv():
@@ -56,11 +52,11 @@ def ensure_venv():
 
     # Upgrade packaging tools
     print("[bootstrap] Upgrading pip/setuptools/wheel ...")
-    subprocess.check_call([str(venv_pip()), "install", "--upgrade", "pip", "setuptools", "wheel"]) 
+    subprocess.check_call([VENV_PIP, "install", "--upgrade", "pip", "setuptools", "wheel"]) 
 
 
 def install_project(editable: bool, reinstall: bool):
-    args = [str(venv_python()), "-m", "pip", "install"]
+    args = [VENV_PYTHON, "-m", "pip", "install"]
     if editable:
         args.append("-e")
     if reinstall:
@@ -73,8 +69,7 @@ def install_project(editable: bool, reinstall: bool):
 def run_in_venv(cmd: list[str]) -> int:
     # Prepend venv bin path so console scripts are found
     env = os.environ.copy()
-    bin_dir = str(VENV_DIR / ("Scripts" if IS_WINDOWS else "bin"))
-    env["PATH"] = bin_dir + os.pathsep + env.get("PATH", "")
+    env["PATH"] = VENV_BIN + os.pathsep + env.get("PATH", "")
     print(f"[bootstrap] Running in venv: {' '.join(cmd)}")
     return subprocess.call(cmd, env=env, cwd=str(ROOT))
 
@@ -1,39 +1,41 @@
 from __future__ import annotations
 
-from enum import Enum
+import json
+import sys
+from collections import Counter
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union, Tuple
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union, Tuple
 
-import yaml
-from pydantic import BaseModel, Field, ValidationError, ConfigDict, model_validator, field_validator
+from pydantic import BaseModel, BeforeValidator, Field, GetCoreSchemaHandler, TypeAdapter, ValidationError, ConfigDict, model_validator, field_validator
+from pydantic_core import core_schema
 
 from . import config_utility as cfgutil
 
 
-# Enums for constrained values
-class Method(str, Enum):
-    GET = "GET"
-    POST = "POST"
-    PUT = "PUT"
-    PATCH = "PATCH"
-    DELETE = "DELETE"
-    HEAD = "HEAD"
-    OPTIONS = "OPTIONS"
+# Literal types for constrained values (validated as plain strings by pydantic-core)
+Method = Literal["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"]
 
+SequenceType = Literal["Sequential", "Concurrent"]
 
-class SequenceType(str, Enum):
-    Sequential = "Sequential"
-    Concurrent = "Concurrent"
+BackoffStrategy = Literal["fixed", "exponential"]
 
+def _lower_jitter(v: Any) -> Any:
+    # Jitter strings have always been matched case-insensitively ("Full", "MIN", ...)
+    return v.lower() if isinstance(v, str) else v
 
-class BackoffStrategy(str, Enum):
-    fixed = "fixed"
-    exponential = "exponential"
+
+# Jitter is a bool or one of the documented string modes (request_manager also honours the floor aliases).
+# "none", "equal" and "decorrelated" are accepted as before but not implemented: they mean no jitter.
+JitterMode = Annotated[
+    Literal[True, False, "full", "min", "max", "floor", "at_least_base", "none", "equal", "decorrelated"],
+    BeforeValidator(_lower_jitter),
+]
 
 
 class Retry(BaseModel):
-    # Ensure enums are serialized as their values when dumping to dicts
-    model_config = ConfigDict(extra='forbid', use_enum_values=True)
+    # Validated config models are never mutated; frozen makes that explicit and enforced
+    model_config = ConfigDict(extra='forbid', frozen=True)
 
     Attempts: int = Field(..., ge=1)
     BackoffStrategy: BackoffStrategy
@@ -41,8 +43,7 @@ class Retry(BaseModel):
     Multiplier: Optional[float] = Field(None, gt=0)
     MaxBackoffSeconds: Optional[float] = Field(None, ge=0)
     MaxElapsedSeconds: Optional[float] = Field(None, ge=0)
-    # README varies wording for Jitter; allow bool or literal strings
-    Jitter: Optional[Union[bool, str]] = None
+    Jitter: Optional[JitterMode] = None
     RetryOnStatus: Optional[List[int]] = None
     RetryOnNetworkErrors: Optional[bool] = None
     RetryOnTimeouts: Optional[bool] = None
@@ -65,6 +66,12 @@ class FlowControlCfg(BaseModel):
     TimeoutSeconds: Optional[int] = Field(None, ge=0)
 
 
+class ResponseCfg(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+    PrettyPrint: Optional[bool] = None
+    Sort: Optional[bool] = None
+
+
 class DefaultsSection(BaseModel):
     model_config = ConfigDict(extra='forbid')
 
@@ -90,14 +97,8 @@ class ForcedSection(BaseModel):
     RetryCfg: Optional[Retry] = Field(None, alias='Retry')
 
 
-class ResponseCfg(BaseModel):
-    model_config = ConfigDict(extra='forbid')
-    PrettyPrint: Optional[bool] = None
-    Sort: Optional[bool] = None
-
-
 class Request(BaseModel):
-    model_config = ConfigDict(extra='forbid')
+    model_config = ConfigDict(extra='forbid', frozen=True)
 
     Method: Method
     URLPath: str
@@ -110,23 +111,47 @@ class Request(BaseModel):
     InsecureTLS: Optional[bool] = None
 
 
-class RequestItem(BaseModel):
-    """Represents one mapping item in Requests list: { <Key>: <Request> }"""
+@dataclass(frozen=True, slots=True)
+class RequestItem:
+    """Represents one mapping item in Requests list: { <Key>: <Request> }
+
+    A slotted dataclass rather than a model, so each item carries just its key and Request.
+    The mapping (and its Request) is still validated natively by pydantic-core; only the
+    single-key rule is checked in Python, after validation.
+    """
 
     key: str
     value: Request
 
     @classmethod
-    def from_mapping(cls, m: Dict[str, Any]) -> "RequestItem":
-        if not isinstance(m, dict) or len(m) != 1:
+    def _from_validated(cls, m: Dict[str, Request]) -> "RequestItem":
+        if len(m) != 1:
             raise ValueError("Each Requests entry must be a single-key mapping: { <Key>: {Request...} }")
-        k, v = next(iter(m.items()))
-        req = Request(**v)
-        return cls(key=k, value=req)
+        ((k, v),) = m.items()
+        return cls(k, v)
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        return core_schema.no_info_after_validator_function(
+            cls._from_validated,
+            handler.generate_schema(Dict[str, Request]),
+            serialization=core_schema.plain_serializer_function_ser_schema(lambda item: {item.key: item.value}),
+        )
+
+    @classmethod
+    def from_mapping(cls, m: Dict[str, Any]) -> "RequestItem":
+        global _request_item_adapter
+        # Built on first use only; configs are normally validated through TopLevelConfig instead
+        if _request_item_adapter is None:
+            _request_item_adapter = TypeAdapter(cls)
+        return _request_item_adapter.validate_python(m)
+
+
+_request_item_adapter: Optional[TypeAdapter[RequestItem]] = None
 
 
 class Sequence(BaseModel):
-    model_config = ConfigDict(extra='forbid')
+    model_config = ConfigDict(extra='forbid', frozen=True)
 
     Name: str
     Type: SequenceType
@@ -135,53 +160,38 @@ class Sequence(BaseModel):
 
     @field_validator('Requests', mode='before')
     @classmethod
-    def validate_requests(cls, v: Any) -> List[RequestItem]:
+    def validate_requests(cls, v: Any) -> Any:
+        # Only the container is checked here; pydantic-core validates each item as a RequestItem
         if not isinstance(v, list) or not v:
             raise ValueError("Requests must be a non-empty list of single-key mappings")
-        items: List[RequestItem] = []
-        for i, elem in enumerate(v):
-            try:
-                items.append(RequestItem.from_mapping(elem))
-            except Exception as e:
-                raise ValueError(f"Requests[{i}]: {e}")
-        return items
+        return v
 
     @model_validator(mode='after')
     def check_concurrency(self) -> 'Sequence':
         t: SequenceType = self.Type
         limit: Optional[int] = self.ConcurrencyLimit
-        if t == SequenceType.Concurrent and limit is None:
+        if t == "Concurrent" and limit is None:
             # Make it required for Concurrent to encourage explicitness
             raise ValueError("ConcurrencyLimit is required when Type is 'Concurrent'")
-        if t == SequenceType.Sequential and limit is not None:
+        if t == "Sequential" and limit is not None:
             # For sequential, ConcurrencyLimit should not be set
             raise ValueError("ConcurrencyLimit should not be set when Type is 'Sequential'")
         return self
 
     @model_validator(mode='after')
     def check_unique_request_keys(self) -> 'Sequence':
-        # Ensure request keys within this sequence are unique
-        keys = [item.key for item in self.Requests]
-        seen = set()
-        dups: list[str] = []
-        for k in keys:
-            if k in seen and k not in dups:
-                dups.append(k)
-            seen.add(k)
-        if dups:
+        # Ensure request keys within this sequence are unique; the per-key counts are only needed to report them
+        if len({item.key for item in self.Requests}) != len(self.Requests):
+            counts = Counter(item.key for item in self.Requests)
+            dups = [k for k, c in counts.items() if c > 1]
             raise ValueError(
                 f"Duplicate request keys are not allowed within a sequence. Duplicates found: {dups}"
             )
         return self
 
 
-class FlowControlCfg(BaseModel):
-    model_config = ConfigDict(extra='forbid')
-    DelaySeconds: Optional[int] = Field(None, ge=0)
-
-
 class StashConfig(BaseModel):
-    model_config = ConfigDict(extra='forbid')
+    model_config = ConfigDict(extra='forbid', frozen=True)
 
     Name: str
     Defaults: DefaultsSection
@@ -201,13 +211,8 @@ class StashConfig(BaseModel):
     @model_validator(mode='after')
     def check_unique_sequence_names(self) -> 'StashConfig':
         # Ensure sequence names are unique across the config
-        names = [seq.Name for seq in self.Sequences]
-        seen = set()
-        dups: list[str] = []
-        for n in names:
-            if n in seen and n not in dups:
-                dups.append(n)
-            seen.add(n)
+        counts = Counter(seq.Name for seq in self.Sequences)
+        dups = [n for n, c in counts.items() if c > 1]
         if dups:
             raise ValueError(
                 f"Duplicate sequence names are not allowed. Duplicates found: {dups}"
@@ -227,14 +232,22 @@ class Dynamics(BaseModel):
 
 
 class TopLevelConfig(BaseModel):
-    """Top-level model. Allows extra keys (anchors/aliases) but requires StashConfig."""
+    """Top-level model. Ignores extra keys (anchor definitions) but requires StashConfig.
+
+    Anchors are already inlined by the YAML loader, so extra top-level keys are dropped
+    rather than stored on the model.
+    """
 
-    model_config = ConfigDict(extra='allow')
+    model_config = ConfigDict(extra='ignore')
 
     StashConfig: StashConfig
     dynamics: Optional[Dynamics] = Field(None, alias='dynamics')
 
 
+# Keys that belong under StashConfig; seeing them at the root means the wrapper was forgotten
+_STASH_CONFIG_CHILDREN = frozenset({'Defaults', 'Forced', 'Retry', 'Sequences', 'Name'})
+
+
 def validate_config_data(data: Dict[str, Any]) -> TopLevelConfig:
     """Validate already-loaded YAML data against the schema.
 
@@ -242,14 +255,16 @@ def validate_config_data(data: Dict[str, Any]) -> TopLevelConfig:
     Additionally, provides a friendlier message if the top-level `StashConfig`
     section is missing but common StashConfig children are present at the root.
     """
+    # Non-mapping input is left for pydantic to reject with its usual error
+    if not isinstance(data, dict):
+        return TopLevelConfig.model_validate(data)
+
     # Normalize alternate capitalization for dynamics
-    if isinstance(data, dict) and 'dynamics' not in data and 'Dynamics' in data:
-        data = dict(data)
-        data['dynamics'] = data.get('Dynamics')
+    if 'dynamics' not in data and 'Dynamics' in data:
+        data = {**data, 'dynamics': data['Dynamics']}
 
-    if isinstance(data, dict) and 'StashConfig' not in data:
-        likely_children = {'Defaults', 'Forced', 'Retry', 'Sequences', 'Name'}
-        present = likely_children.intersection(data.keys())
+    if 'StashConfig' not in data:
+        present = data.keys() & _STASH_CONFIG_CHILDREN
         if present:
             raise ValueError(
                 "Top-level 'StashConfig' section is missing. Your YAML appears to place "
@@ -261,28 +276,150 @@ def validate_config_data(data: Dict[str, Any]) -> TopLevelConfig:
                 "  Retry:    { ... }  # optional\n"
                 "  Sequences: [ ... ]\n"
             )
-    return TopLevelConfig(**data)
+    return TopLevelConfig.model_validate(data)
+
+
+def _safe_loader() -> type:
+    """Return the fastest available PyYAML safe loader class (libyaml-backed if present)."""
+    try:
+        from yaml import CSafeLoader as _SafeLoader
+    except ImportError:
+        from yaml import SafeLoader as _SafeLoader
+    return _SafeLoader
+
+
+def _load_yaml(raw: bytes) -> Any:
+    """Parse YAML config bytes with the fastest available safe loader (libyaml if present).
+
+    Kept on PyYAML rather than a YAML 1.2 parser: configs rely on YAML 1.1 merge keys
+    (`<<: *anchor`) and boolean spellings such as `yes`/`no`.
+    """
+    # Imported lazily so importing this module (e.g. for `--help`) does not pay for PyYAML
+    import yaml
+    return yaml.load(raw, Loader=_safe_loader())
+
+
+def read_config_header(path: Union[str, Path]) -> Tuple[bool, Optional[str]]:
+    """Cheaply probe a YAML config for `(has StashConfig section, StashConfig.Name)`.
+
+    Walks parser events only, without constructing Python objects, and stops as soon as
+    the Name is found. Best-effort metadata for tools; a Name supplied via an alias or merge
+    key is reported as None. Use validate_config_path for anything authoritative.
+    """
+    import yaml
+
+    p = Path(path)
+    if not p.exists() or not p.is_file():
+        raise FileNotFoundError(f"Config file not found: {p}")
+
+    with p.open('rb') as f:
+        events = yaml.parse(f, Loader=_safe_loader())
+
+        def _skip(ev: Any) -> None:
+            # Consume the remainder of a value node whose start event was just read
+            depth = 1 if isinstance(ev, yaml.CollectionStartEvent) else 0
+            while depth:
+                ev = next(events)
+                if isinstance(ev, yaml.CollectionStartEvent):
+                    depth += 1
+                elif isinstance(ev, yaml.CollectionEndEvent):
+                    depth -= 1
+
+        def _mapping_keys():
+            # Yield each scalar key of the current mapping; the caller consumes or skips its value
+            while True:
+                ev = next(events)
+                if isinstance(ev, yaml.MappingEndEvent):
+                    return
+                if isinstance(ev, yaml.ScalarEvent):
+                    yield ev.value
+                else:
+                    # Complex or aliased key: skip it and its value
+                    _skip(ev)
+                    _skip(next(events))
+
+        for ev in events:
+            if isinstance(ev, yaml.MappingStartEvent):
+                break
+            if isinstance(ev, (yaml.NodeEvent, yaml.DocumentEndEvent)):
+                # Root is not a mapping (or the document is empty)
+                return False, None
+        else:
+            return False, None
+
+        for key in _mapping_keys():
+            ev = next(events)
+            if key != 'StashConfig':
+                _skip(ev)
+                continue
+            if not isinstance(ev, yaml.MappingStartEvent):
+                return True, None
+            for sc_key in _mapping_keys():
+                ev = next(events)
+                if sc_key == 'Name':
+                    return True, (ev.value if isinstance(ev, yaml.ScalarEvent) else None)
+                _skip(ev)
+            return True, None
+    return False, None
+
+
+# Scalar fields whose values repeat across requests; interned alongside mapping keys
+_INTERN_VALUE_KEYS = frozenset({'Method', 'URLRoot'})
+
+
+def _intern_strings(data: Any) -> Any:
+    """Intern mapping keys (and Method/URLRoot values) of freshly loaded YAML in place.
+
+    PyYAML creates a new str for every occurrence, so keys such as `Content-Type` or
+    `Authorization` repeated across requests are otherwise stored once per request.
+    """
+    stack = [data]
+    seen = set()
+    while stack:
+        node = stack.pop()
+        # Aliased nodes are the same object; walk each container once
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if isinstance(node, dict):
+            items = list(node.items())
+            node.clear()
+            for k, v in items:
+                if type(k) is str and len(k) <= 40:
+                    k = sys.intern(k)
+                    if k in _INTERN_VALUE_KEYS and type(v) is str and len(v) <= 40:
+                        v = sys.intern(v)
+                node[k] = v
+                if isinstance(v, (dict, list)):
+                    stack.append(v)
+        elif isinstance(node, list):
+            stack.extend(v for v in node if isinstance(v, (dict, list)))
+    return data
 
 
 def validate_config_path(path: Union[str, Path]) -> TopLevelConfig:
     p = Path(path)
     if not p.exists() or not p.is_file():
         raise FileNotFoundError(f"Config file not found: {p}")
-    with p.open('r', encoding='utf-8') as f:
-        data = yaml.safe_load(f) or {}
+    # Read as bytes in one go; the loader detects the encoding itself, which avoids a Python-level decode
+    raw = p.read_bytes()
+    if p.suffix.lower() == '.json':
+        # JSON is a subset of YAML; the C json decoder parses it far faster than any YAML loader
+        data = json.loads(raw) or {}
+    else:
+        # The json decoder already shares repeated keys; PyYAML does not
+        data = _intern_strings(_load_yaml(raw) or {})
     return validate_config_data(data)
 
 
 def format_validation_error(err: Union[ValidationError, Exception]) -> str:
     """Return a human-friendly string for Pydantic validation errors."""
     if isinstance(err, ValidationError):
-        lines: List[str] = ["Validation failed with the following errors:"]
-        for e in err.errors():
-            loc = ".".join(str(x) for x in e.get('loc', []))
-            msg = e.get('msg', 'Invalid value')
-            typ = e.get('type', '')
-            lines.append(f" - {loc}: {msg} ({typ})")
-        return "\n".join(lines)
+        # include_url=False: the docs URL is not part of the message, so skip building it
+        return "Validation failed with the following errors:\n" + "\n".join(
+            f" - {'.'.join(map(str, e.get('loc', ())))}: {e.get('msg', 'Invalid value')} ({e.get('type', '')})"
+            for e in err.errors(include_url=False)
+        )
     else:
         return f"Validation failed: {err}"
 
@@ -291,11 +428,21 @@ def format_validation_error(err: Union[ValidationError, Exception]) -> str:
 # Resolution helpers
 # ---------------------------
 
-def _copy_map(m: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    if m is None:
-        return None
-    # shallow copy is fine because values are primitives or nested dicts already materialized by yaml loader
-    return dict(m)
+def _merge_section(req_map: Any, default_map: Any, forced_map: Any) -> Any:
+    """Return the effective value for one already-resolved Headers/Body/Query section.
+
+    Uses the request section if present, else the Defaults section, then overlays Forced.
+    The result may be a shared (read-only) map when there is nothing to overlay. A section
+    that resolved to a non-mapping (e.g. a whole-section `$secrets` object) is not merged;
+    Forced wins when present.
+    """
+    base = req_map if req_map is not None else default_map
+    if forced_map is None:
+        return base
+    if not isinstance(base, dict) or not isinstance(forced_map, dict):
+        return forced_map
+    # Single C-level merge instead of copy + update
+    return {**base, **forced_map}
 
 
 def _resolve_func_obj(obj: Dict[str, Any]) -> Any:
@@ -366,12 +513,11 @@ def _resolve_dynamic_obj(obj: Dict[str, Any], dyn: Optional[Dynamics], secrets:
     template = pat.template
     sets = dyn.sets or {}
     if when == "request":
-        # Validate template now to ensure secrets/sets are valid, but keep as deferred for request-time materialization
-        try:
+        # Validate template now to ensure secrets/sets are valid, but keep as deferred for request-time materialization.
+        # A pattern already in resolved_cache was expanded successfully with these same secrets/sets, so it is
+        # known valid; this keeps validation to once per pattern rather than once per occurrence.
+        if resolved_cache is None or pattern_name not in resolved_cache:
             cfgutil.dynamic_expand(template, sets, secrets=secrets, redact_secrets=True)
-        except Exception as e:
-            # Re-raise to fail validation early with informative message
-            raise e
         return {"$deferred": {"dynamic": {"template": template, "sets": sets}}}
     # resolve now: use precomputed cache if available to ensure a single value per pattern per resolved file
     if resolved_cache is not None:
@@ -383,66 +529,118 @@ def _resolve_dynamic_obj(obj: Dict[str, Any], dyn: Optional[Dynamics], secrets:
     return cfgutil.dynamic_expand(template, sets, secrets=secrets, redact_secrets=redact_secrets)
 
 
+# (field name, output key) pairs per flat model class, computed on first use
+_DUMP_FIELDS: Dict[type, Tuple[Tuple[str, str], ...]] = {}
+
+
+def _model_to_dict(m: BaseModel) -> Dict[str, Any]:
+    """Project an already-validated flat model to a plain dict keyed by alias, omitting None values.
+
+    Equivalent to model_dump(by_alias=True, exclude_none=True) for models without nested models,
+    but reads attributes directly instead of going through the pydantic serializer.
+    """
+    cls = type(m)
+    fields = _DUMP_FIELDS.get(cls)
+    if fields is None:
+        fields = tuple((name, f.alias or name) for name, f in cls.model_fields.items())
+        _DUMP_FIELDS[cls] = fields
+    out: Dict[str, Any] = {}
+    for name, key in fields:
+        v = getattr(m, name)
+        if v is not None:
+            out[key] = v
+    return out
+
+
+# Mapping keys that turn a dict into a special object _resolve_values replaces
+_RESOLVABLE_KEYS = ("$secrets", "$func", "$timestamp", "$dynamic")
+
+
+def _needs_resolve(value: Any) -> bool:
+    """Return True if anything in the value tree would be changed by _resolve_values.
+
+    A cheap read-only scan that stops at the first resolvable token, so plain sections can be
+    passed through without rebuilding every container.
+    """
+    stack = [value]
+    while stack:
+        v = stack.pop()
+        if isinstance(v, dict):
+            if "$deferred" in v:
+                # Deferred markers are passed through untouched
+                continue
+            for k in _RESOLVABLE_KEYS:
+                if k in v:
+                    return True
+            stack.extend(v.values())
+        elif isinstance(v, list):
+            stack.extend(v)
+        elif isinstance(v, str) and "$secrets" in v:
+            return True
+    return False
+
+
 def _resolve_values(value: Any, dyn: Optional[Dynamics], secrets: Optional[Dict[str, str]] = None, redact_secrets: bool = False, resolved_cache: Optional[Dict[str, Any]] = None) -> Any:
-    """Recursively resolve any function-call, $dynamic objects, and $secrets references.
+    """Resolve any function-call, $dynamic objects, and $secrets references throughout a value tree.
 
     - Supports mapping form: {"$secrets": "keyName"}
     - Supports inline string form: "... { $secrets: keyName } ..."
     - When redact_secrets is True, any resolved secret values are replaced with "***REDACTED***" in the returned structure.
     - If a secret is requested but no secrets were provided, raises a ValueError.
+
+    The tree is walked iteratively with an explicit work stack, so deep nesting costs no Python
+    frames and cannot hit the recursion limit. A tree with nothing to resolve is returned as-is
+    (callers treat it as read-only); otherwise plain dicts/lists are rebuilt as new containers.
     """
-    # Helper for inline secret replacement inside strings
-    def _replace_inline_secrets(s: str) -> str:
-        import re as _re
-        pattern = _re.compile(r"\{\s*\$secrets\s*:\s*([A-Za-z0-9_\-\.]+)\s*\}")
-        def _rep(m):
-            key = m.group(1)
-            if secrets is None:
-                raise ValueError(f"Secret '{key}' requested but no --secrets file was provided")
-            if key not in secrets:
-                raise ValueError(f"Unknown secret requested: '{key}'")
-            return "***REDACTED***" if redact_secrets else str(secrets[key])
-        return pattern.sub(_rep, s)
-
-    if isinstance(value, dict):
-        # Don't touch already-deferred nodes
-        if "$deferred" in value:
-            return value
-        # Mapping form for secrets
-        if "$secrets" in value:
-            skey = value.get("$secrets")
-            if not isinstance(skey, str):
-                raise ValueError("$secrets must be used as a string key name, e.g., { $secrets: my_key }")
-            if secrets is None:
-                raise ValueError(f"Secret '{skey}' requested but no --secrets file was provided")
-            if skey not in secrets:
-                raise ValueError(f"Unknown secret requested: '{skey}'")
-            return "***REDACTED***" if redact_secrets else str(secrets[skey])
-        # Check if this dict itself is a function-call object
-        if "$func" in value or "$timestamp" in value:
-            return _resolve_func_obj(value)
-        # Check if it's a dynamic object
-        if "$dynamic" in value:
-            return _resolve_dynamic_obj(value, dyn, secrets, redact_secrets, resolved_cache)
-        # Else resolve each entry
-        return {k: _resolve_values(v, dyn, secrets, redact_secrets, resolved_cache) for k, v in value.items()}
-    if isinstance(value, list):
-        return [_resolve_values(v, dyn, secrets, redact_secrets, resolved_cache) for v in value]
-    if isinstance(value, str):
-        return _replace_inline_secrets(value)
-    # primitives unchanged
-    return value
-
-
-# Ensure forward references are resolved for models that refer to each other
-try:
-    # In Pydantic v2, model_rebuild resolves forward refs
-    ns = globals()
-    StashConfig.model_rebuild(force=True, _types_namespace=ns)
-    TopLevelConfig.model_rebuild(force=True, _types_namespace=ns)
-except Exception:
-    # Safe to ignore if rebuild not necessary
-    pass
+    if not _needs_resolve(value):
+        return value
+
+    # Pending (output container, source items) pairs still to be filled
+    stack: List[Tuple[Any, Any]] = []
+
+    def _node(v: Any) -> Any:
+        if isinstance(v, dict):
+            # Don't touch already-deferred nodes
+            if "$deferred" in v:
+                return v
+            # Mapping form for secrets
+            if "$secrets" in v:
+                skey = v.get("$secrets")
+                if not isinstance(skey, str):
+                    raise ValueError("$secrets must be used as a string key name, e.g., { $secrets: my_key }")
+                if secrets is None:
+                    raise ValueError(f"Secret '{skey}' requested but no --secrets file was provided")
+                if skey not in secrets:
+                    raise ValueError(f"Unknown secret requested: '{skey}'")
+                return "***REDACTED***" if redact_secrets else str(secrets[skey])
+            # Check if this dict itself is a function-call object
+            if "$func" in v or "$timestamp" in v:
+                return _resolve_func_obj(v)
+            # Check if it's a dynamic object
+            if "$dynamic" in v:
+                return _resolve_dynamic_obj(v, dyn, secrets, redact_secrets, resolved_cache)
+            # Else resolve each entry once popped from the stack
+            out: Dict[str, Any] = {}
+            stack.append((out, v.items()))
+            return out
+        if isinstance(v, list):
+            out_l: List[Any] = []
+            stack.append((out_l, v))
+            return out_l
+        if isinstance(v, str):
+            return cfgutil.replace_inline_secrets(v, secrets, redact_secrets)
+        # primitives unchanged
+        return v
+
+    result = _node(value)
+    while stack:
+        out, src = stack.pop()
+        if isinstance(out, dict):
+            for k, v in src:
+                out[k] = _node(v)
+        else:
+            out.extend(_node(v) for v in src)
+    return result
 
 
 def build_resolved_config_dict(cfg: TopLevelConfig, secrets: Optional[Dict[str, str]] = None, redact_secrets: bool = False) -> Dict[str, Any]:
@@ -450,15 +648,22 @@ def build_resolved_config_dict(cfg: TopLevelConfig, secrets: Optional[Dict[str,
 
     Rules:
     - For sections Headers/Body/Query: use request section if present, else Defaults.section; then overlay Forced.section.
+      Defaults/Forced sections are resolved once, so their resolve-time values are shared by every request.
     - Retry precedence respects explicit nulls: request.Retry (even null) > Defaults.Retry (even null).
       Only fall through when a level omits the Retry field entirely.
     - Anchors are already resolved by yaml.safe_load; we also ensure the resulting dict contains plain maps.
+
+    The result shares data with ``cfg``: Headers/Body/Query sections with nothing to resolve are the
+    validated model's own dicts. Defaults/Forced sections, Retry and Response dumps are shared by
+    every request that inherits them, and by other builds from the same ``cfg`` (e.g. the actual and
+    redacted ones). Only the top-level, per-sequence and per-request block dicts are new. Callers may
+    replace keys in those blocks but must not mutate any value nested below them.
     """
     sc = cfg.StashConfig
     defaults = sc.Defaults
     forced = sc.Forced
 
-    dyn = getattr(cfg, 'dynamics', None)
+    dyn = cfg.dynamics
 
     # Precompute resolve-time dynamic values once per config to ensure consistency across requests
     resolved_dyn_cache: Optional[Dict[str, Any]] = None
@@ -469,15 +674,35 @@ def build_resolved_config_dict(cfg: TopLevelConfig, secrets: Optional[Dict[str,
             # Compute a single value per pattern for this resolved file
             resolved_dyn_cache[name] = cfgutil.dynamic_expand(pat.template, sets, secrets=secrets, redact_secrets=redact_secrets)
 
-    # Helper to detect if a Pydantic field was provided (even if its value is None)
-    def _provided(m: Any, field_name: str) -> bool:
-        try:
-            fs = getattr(m, 'model_fields_set')
-        except Exception:
-            fs = None
-        if isinstance(fs, set):
-            return field_name in fs
-        return False
+    # Each distinct Retry instance is dumped once; requests sharing it share the dumped dict
+    retry_cache: Dict[int, Dict[str, Any]] = {}
+
+    def _dump_retry(r: Retry) -> Dict[str, Any]:
+        k = id(r)
+        v = retry_cache.get(k)
+        if v is None:
+            v = _model_to_dict(r)
+            retry_cache[k] = v
+        return v
+
+    # Fields explicitly provided (even if their value is None); looked up once rather than per check
+    defaults_fs = defaults.model_fields_set if defaults is not None else frozenset()
+    forced_fs = forced.model_fields_set if forced is not None else frozenset()
+
+    # Resolve Defaults/Forced sections once; requests inheriting them reuse these results
+    def _resolve_section(m: Optional[Dict[str, Any]]) -> Any:
+        return _resolve_values(m, dyn, secrets, redact_secrets, resolved_dyn_cache) if m is not None else None
+
+    res_def_headers = _resolve_section(defaults.Headers) if defaults is not None else None
+    res_def_body = _resolve_section(defaults.Body) if defaults is not None else None
+    res_def_query = _resolve_section(defaults.Query) if defaults is not None else None
+    res_forced_headers = _resolve_section(forced.Headers) if forced is not None else None
+    res_forced_body = _resolve_section(forced.Body) if forced is not None else None
+    res_forced_query = _resolve_section(forced.Query) if forced is not None else None
+    # Defaults.Response is dumped once and shared by the Defaults block and every inheriting request
+    def_response_dump: Optional[Dict[str, Any]] = None
+    if defaults is not None and defaults.Response is not None:
+        def_response_dump = _model_to_dict(defaults.Response)
 
     sc_out: Dict[str, Any] = {"Name": sc.Name}
 
@@ -494,96 +719,97 @@ def build_resolved_config_dict(cfg: TopLevelConfig, secrets: Optional[Dict[str,
             if defaults.FlowControl.TimeoutSeconds is not None:
                 fc["TimeoutSeconds"] = defaults.FlowControl.TimeoutSeconds
             d["FlowControl"] = fc
-        if defaults.Headers is not None:
-            d["Headers"] = _resolve_values(_copy_map(defaults.Headers), dyn, secrets, redact_secrets, resolved_dyn_cache)
-        if defaults.Body is not None:
-            d["Body"] = _resolve_values(_copy_map(defaults.Body), dyn, secrets, redact_secrets, resolved_dyn_cache)
-        if defaults.Query is not None:
-            d["Query"] = _resolve_values(_copy_map(defaults.Query), dyn, secrets, redact_secrets, resolved_dyn_cache)
-        if _provided(defaults, 'RetryCfg'):
+        if res_def_headers is not None:
+            d["Headers"] = res_def_headers
+        if res_def_body is not None:
+            d["Body"] = res_def_body
+        if res_def_query is not None:
+            d["Query"] = res_def_query
+        if 'RetryCfg' in defaults_fs:
             if defaults.RetryCfg is None:
                 d["Retry"] = None
             else:
-                d["Retry"] = defaults.RetryCfg.model_dump(by_alias=True, exclude_none=True)
-        if defaults.Response is not None:
-            d["Response"] = defaults.Response.model_dump(exclude_none=True)
+                d["Retry"] = _dump_retry(defaults.RetryCfg)
+        if def_response_dump is not None:
+            d["Response"] = def_response_dump
         # Include InsecureTLS only if provided; effective default is False when omitted
-        if _provided(defaults, 'InsecureTLS') and defaults.InsecureTLS is not None:
+        if 'InsecureTLS' in defaults_fs and defaults.InsecureTLS is not None:
             d["InsecureTLS"] = bool(defaults.InsecureTLS)
         if d:
             sc_out["Defaults"] = d
 
     if forced is not None:
         f: Dict[str, Any] = {}
-        if forced.Headers is not None:
-            f["Headers"] = _resolve_values(_copy_map(forced.Headers), dyn, secrets, redact_secrets, resolved_dyn_cache)
-        if forced.Body is not None:
-            f["Body"] = _resolve_values(_copy_map(forced.Body), dyn, secrets, redact_secrets, resolved_dyn_cache)
-        if forced.Query is not None:
-            f["Query"] = _resolve_values(_copy_map(forced.Query), dyn, secrets, redact_secrets, resolved_dyn_cache)
-        if _provided(forced, 'RetryCfg'):
+        if res_forced_headers is not None:
+            f["Headers"] = res_forced_headers
+        if res_forced_body is not None:
+            f["Body"] = res_forced_body
+        if res_forced_query is not None:
+            f["Query"] = res_forced_query
+        if 'RetryCfg' in forced_fs:
             # Generally Forced.Retry is not expected; but if provided, include for transparency (including explicit null)
             if forced.RetryCfg is None:
                 f["Retry"] = None
             else:
-                f["Retry"] = forced.RetryCfg.model_dump(by_alias=True, exclude_none=True)
+                f["Retry"] = _dump_retry(forced.RetryCfg)
         if f:
             sc_out["Forced"] = f
 
 
+    # Inherited Retry/FlowControl, computed once rather than per request
+    # Requests inheriting Defaults.Retry share this dump (via retry_cache); the resolved tree is only read downstream
+    def_retry_dump: Optional[Dict[str, Any]] = None
+    if defaults is not None and defaults.RetryCfg is not None:
+        def_retry_dump = _dump_retry(defaults.RetryCfg)
+    def_fc: Dict[str, Any] = {}
+    if defaults is not None and defaults.FlowControl is not None:
+        if defaults.FlowControl.DelaySeconds is not None:
+            def_fc["DelaySeconds"] = defaults.FlowControl.DelaySeconds
+        if defaults.FlowControl.TimeoutSeconds is not None:
+            def_fc["TimeoutSeconds"] = defaults.FlowControl.TimeoutSeconds
+    # Remaining Defaults-level decisions, identical for every request
+    def_retry_set = 'RetryCfg' in defaults_fs
+    def_url_root = defaults.URLRoot if defaults is not None else None
+    def_insecure = bool(defaults.InsecureTLS) if defaults is not None and defaults.InsecureTLS is not None else False
+
     # Sequences with resolved requests
     seq_list: List[Dict[str, Any]] = []
     for seq in sc.Sequences:
         seq_out: Dict[str, Any] = {
             "Name": seq.Name,
-            "Type": seq.Type.value,
+            "Type": seq.Type,
         }
         if seq.ConcurrencyLimit is not None:
             seq_out["ConcurrencyLimit"] = seq.ConcurrencyLimit
 
         resolved_requests: List[Dict[str, Any]] = []
         for item in seq.Requests:
-            req = item.value
-
-            # base sections per rules
-            headers = _copy_map(req.Headers) if req.Headers is not None else _copy_map(defaults.Headers) if (defaults and defaults.Headers is not None) else None
-            body = _copy_map(req.Body) if req.Body is not None else _copy_map(defaults.Body) if (defaults and defaults.Body is not None) else None
-            query = _copy_map(req.Query) if req.Query is not None else _copy_map(defaults.Query) if (defaults and defaults.Query is not None) else None
-
-            # overlay forced last
-            if forced is not None and forced.Headers is not None:
-                headers = headers or {}
-                headers.update(forced.Headers)
-            if forced is not None and forced.Body is not None:
-                body = body or {}
-                body.update(forced.Body)
-            if forced is not None and forced.Query is not None:
-                query = query or {}
-                query.update(forced.Query)
-
-            # resolve any function-call or dynamic objects after merges
-            headers = _resolve_values(headers, dyn, secrets, redact_secrets, resolved_dyn_cache) if headers is not None else None
-            body = _resolve_values(body, dyn, secrets, redact_secrets, resolved_dyn_cache) if body is not None else None
-            query = _resolve_values(query, dyn, secrets, redact_secrets, resolved_dyn_cache) if query is not None else None
+            req_key, req = item.key, item.value
+            req_fs = req.model_fields_set
+
+            # resolve only the request's own sections, then apply base/forced rules on resolved values
+            headers = _merge_section(_resolve_section(req.Headers), res_def_headers, res_forced_headers)
+            body = _merge_section(_resolve_section(req.Body), res_def_body, res_forced_body)
+            query = _merge_section(_resolve_section(req.Query), res_def_query, res_forced_query)
 
             # resolve retry precedence with explicit-null awareness
             retry_set = False
-            retry_value: Optional[Retry] = None
+            retry_out: Optional[Dict[str, Any]] = None
 
-            if _provided(req, 'RetryCfg'):
+            if 'RetryCfg' in req_fs:
                 retry_set = True
-                retry_value = req.RetryCfg  # may be None
-            elif defaults is not None and _provided(defaults, 'RetryCfg'):
+                if req.RetryCfg is not None:  # may be an explicit null
+                    retry_out = _dump_retry(req.RetryCfg)
+            elif def_retry_set:
                 retry_set = True
-                retry_value = defaults.RetryCfg
+                retry_out = def_retry_dump
 
-            req_out: Dict[str, Any] = {
-                item.key: {
-                    "Method": req.Method.value,
-                    "URLPath": req.URLPath,
-                }
+            # Built straight from validated attributes; no serializer round-trip
+            inner: Dict[str, Any] = {
+                "Method": req.Method,
+                "URLPath": req.URLPath,
             }
-            inner = req_out[item.key]
+            req_out: Dict[str, Any] = {req_key: inner}
             if headers is not None:
                 inner["Headers"] = headers
             if body is not None:
@@ -592,19 +818,14 @@ def build_resolved_config_dict(cfg: TopLevelConfig, secrets: Optional[Dict[str,
                 inner["Query"] = query
             # Include Response block if provided; else inherit from Defaults if present
             if req.Response is not None:
-                inner["Response"] = req.Response.model_dump(exclude_none=True)
-            elif defaults is not None and defaults.Response is not None:
-                inner["Response"] = defaults.Response.model_dump(exclude_none=True)
+                inner["Response"] = _model_to_dict(req.Response)
+            elif def_response_dump is not None:
+                inner["Response"] = def_response_dump
             # Always include effective URLRoot from Defaults
-            if defaults and defaults.URLRoot:
-                inner["URLRoot"] = defaults.URLRoot
+            if def_url_root:
+                inner["URLRoot"] = def_url_root
             # Include effective FlowControl (Defaults overridden by per-request)
-            fc_eff: Dict[str, Any] = {}
-            if defaults and defaults.FlowControl is not None:
-                if defaults.FlowControl.DelaySeconds is not None:
-                    fc_eff["DelaySeconds"] = defaults.FlowControl.DelaySeconds
-                if defaults.FlowControl.TimeoutSeconds is not None:
-                    fc_eff["TimeoutSeconds"] = defaults.FlowControl.TimeoutSeconds
+            fc_eff: Dict[str, Any] = dict(def_fc)
             if req.FlowControl is not None:
                 if req.FlowControl.DelaySeconds is not None:
                     fc_eff["DelaySeconds"] = req.FlowControl.DelaySeconds
@@ -614,18 +835,13 @@ def build_resolved_config_dict(cfg: TopLevelConfig, secrets: Optional[Dict[str,
                 inner["FlowControl"] = fc_eff
 
             # Effective InsecureTLS: default False; Defaults.InsecureTLS if provided; overridden by request-level if provided
-            insecure_eff = False
-            if defaults is not None and getattr(defaults, 'InsecureTLS', None) is not None:
-                insecure_eff = bool(defaults.InsecureTLS)
-            if getattr(req, 'InsecureTLS', None) is not None:
+            insecure_eff = def_insecure
+            if req.InsecureTLS is not None:
                 insecure_eff = bool(req.InsecureTLS)
-            inner["InsecureTLS"] = bool(insecure_eff)
+            inner["InsecureTLS"] = insecure_eff
 
             if retry_set:
-                if retry_value is None:
-                    inner["Retry"] = None
-                else:
-                    inner["Retry"] = retry_value.model_dump(by_alias=True, exclude_none=True)
+                inner["Retry"] = retry_out
 
             resolved_requests.append(req_out)
 
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import os
 from pathlib import Path
 import re
-import uuid
+import secrets as _secrets
+import time
 import random
 from typing import Any, Dict, List, Literal, Mapping, Optional, Tuple
 
@@ -16,19 +17,133 @@ def timestamp(fmt: Literal["epoch_ms", "epoch_s", "iso_8601"] = "iso_8601"):
     - epoch_s: seconds since Unix epoch (int)
     - iso_8601: ISO 8601 string in UTC with 'Z' suffix, e.g., 2025-09-17T19:35:00Z
     """
-    now = datetime.now(timezone.utc)
+    # One clock read; formatted from a struct_time to skip datetime/strftime overhead
+    now = time.time()
     if fmt == "epoch_ms":
-        return int(now.timestamp() * 1000)
+        return int(now * 1000)
     if fmt == "epoch_s":
-        return int(now.timestamp())
+        return int(now)
     if fmt == "iso_8601":
         # Use Z suffix to indicate UTC
-        return now.strftime("%Y-%m-%dT%H:%M:%SZ")
+        tm = time.gmtime(now)
+        return f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}T{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}Z"
     raise ValueError(f"Unsupported timestamp format: {fmt}")
 
 
 _HEX_CHARS = "0123456789ABCDEF"
+_ALNUM_CHARS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+_NUM_CHARS = "0123456789"
+_ALPHA_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+# Upper bound for N in ${hex:N} and friends, so a typo cannot allocate an arbitrarily large string
+_MAX_RANDOM_LEN = 1 << 20
 _PLACEHOLDER_RE = re.compile(r"\$\{([^}:]+)(?::([^}:]+))?(?::([^}]+))?\}")
+_INLINE_SECRETS_RE = re.compile(r"\{\s*\$secrets\s*:\s*([A-Za-z0-9_\-\.]+)\s*\}")
+
+
+def replace_inline_secrets(s: str, secrets: Optional[Dict[str, str]], redact_secrets: bool = False) -> str:
+    """Replace inline "{ $secrets: KEY }" references inside a string."""
+    # Plain substring test first: most strings carry no secret reference
+    if "$secrets" not in s:
+        return s
+
+    # Same finditer/join shape as dynamic_expand, so no callback closure is built per call
+    parts: List[str] = []
+    pos = 0
+    for m in _INLINE_SECRETS_RE.finditer(s):
+        key = m.group(1)
+        if secrets is None:
+            raise ValueError(f"Secret '{key}' requested but no --secrets file was provided")
+        if key not in secrets:
+            raise ValueError(f"Unknown secret requested: '{key}'")
+        parts.append(s[pos:m.start()])
+        parts.append("***REDACTED***" if redact_secrets else str(secrets[key]))
+        pos = m.end()
+    if not parts:
+        return s
+    parts.append(s[pos:])
+    return "".join(parts)
+
+
+# Placeholder handlers for dynamic_expand, dispatched by name through _PLACEHOLDER_HANDLERS.
+# Each takes (arg1, arg2, sets, secrets, redact_secrets) and returns the replacement text.
+
+def _random_len(name: str, arg1: Optional[str]) -> int:
+    try:
+        n = int(arg1)
+    except (TypeError, ValueError):
+        raise ValueError(f"${{{name}:N}} requires integer N; got: {arg1!r}") from None
+    if n < 0 or n > _MAX_RANDOM_LEN:
+        raise ValueError(f"${{{name}:N}} requires 0 <= N <= {_MAX_RANDOM_LEN}; got: {n}")
+    return n
+
+
+def _random_chars_handler(name: str, chars: str):
+    def _handler(arg1, arg2, sets, secrets, redact_secrets) -> str:
+        return "".join(random.choices(chars, k=_random_len(name, arg1)))
+    return _handler
+
+
+def _h_hex(arg1, arg2, sets, secrets, redact_secrets) -> str:
+    n = _random_len("hex", arg1)
+    if n >= 16:
+        # Long runs come from the OS entropy source in one C call rather than n PRNG picks;
+        # short ones stay on `random` so they remain reproducible under random.seed()
+        return _secrets.token_hex((n + 1) // 2)[:n].upper()
+    return "".join(random.choices(_HEX_CHARS, k=n))
+
+
+def _h_uuidv4(arg1, arg2, sets, secrets, redact_secrets) -> str:
+    # Same bits as str(uuid.uuid4()), formatted straight from the random bytes without a UUID object
+    b = bytearray(os.urandom(16))
+    b[6] = (b[6] & 0x0F) | 0x40
+    b[8] = (b[8] & 0x3F) | 0x80
+    h = b.hex()
+    return f"{h[0:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:32]}"
+
+
+def _h_timestamp(arg1, arg2, sets, secrets, redact_secrets) -> str:
+    fmt = arg1 or "iso_8601"
+    return str(timestamp(fmt))
+
+
+def _h_secrets(arg1, arg2, sets, secrets, redact_secrets) -> str:
+    key = arg1
+    if not key:
+        raise ValueError("${secrets:KEY} requires a secret key name")
+    if secrets is None:
+        raise ValueError(f"Secret '{key}' requested but no --secrets file was provided")
+    if key not in secrets:
+        raise ValueError(f"Unknown secret requested: '{key}'")
+    return "***REDACTED***" if redact_secrets else str(secrets[key])
+
+
+def _h_choice(arg1, arg2, sets, secrets, redact_secrets) -> str:
+    if not arg1:
+        raise ValueError("${choice:setName} requires a set name")
+    if arg2 is not None:
+        # Disallow multi-selection/repeat for choice to enforce single selection
+        raise ValueError("${choice:setName} does not support multiple selections")
+    pool = sets.get(arg1)
+    if pool is None:
+        raise ValueError(f"Unknown choice set: {arg1}")
+    if not pool:
+        raise ValueError(f"Choice set is empty: {arg1}")
+    # Direct index from one random() call; cheaper than random.choice's rejection sampling
+    return pool[int(random.random() * len(pool))]
+
+
+_PLACEHOLDER_HANDLERS = {
+    "hex": _h_hex,
+    "alphanumeric": _random_chars_handler("alphanumeric", _ALNUM_CHARS),
+    "numeric": _random_chars_handler("numeric", _NUM_CHARS),
+    "alpha": _random_chars_handler("alpha", _ALPHA_CHARS),
+    "uuidv4": _h_uuidv4,
+    "timestamp": _h_timestamp,
+    "@timestamp": _h_timestamp,
+    "secrets": _h_secrets,
+    "secret": _h_secrets,
+    "choice": _h_choice,
+}
 
 
 def dynamic_expand(template: str, sets: Optional[Dict[str, List[str]]] = None, *, secrets: Optional[Dict[str, str]] = None, redact_secrets: bool = False) -> str:
@@ -47,113 +162,129 @@ def dynamic_expand(template: str, sets: Optional[Dict[str, List[str]]] = None, *
       - ${secrets:KEY}            → inject secret by KEY from the --secrets file (redacted when requested)
         Also supported in inline form within strings: "... { $secrets: KEY } ..."
     """
-    sets = sets or {}
-
-    def repl(m: re.Match) -> str:
-        name = m.group(1)
-        arg1 = m.group(2)
-        arg2 = m.group(3)
-        if name == "hex":
-            if not arg1 or not arg1.isdigit():
-                raise ValueError(f"${{hex:N}} requires integer N; got: {arg1!r}")
-            n = int(arg1)
-            return "".join(random.choice(_HEX_CHARS) for _ in range(n))
-        if name == "uuidv4":
-            return str(uuid.uuid4())
-        if name == "timestamp" or name == "@timestamp":
-            fmt = arg1 or "iso_8601"
-            return str(timestamp(fmt))
-        if name == "secrets" or name == "secret":
-            key = arg1
-            if not key:
-                raise ValueError("${secrets:KEY} requires a secret key name")
-            if secrets is None:
-                raise ValueError(f"Secret '{key}' requested but no --secrets file was provided")
-            if key not in secrets:
-                raise ValueError(f"Unknown secret requested: '{key}'")
-            return "***REDACTED***" if redact_secrets else str(secrets[key])
-        if name == "choice":
-            if not arg1:
-                raise ValueError("${choice:setName} requires a set name")
-            if arg2 is not None:
-                # Disallow multi-selection/repeat for choice to enforce single selection
-                raise ValueError("${choice:setName} does not support multiple selections")
-            pool = sets.get(arg1)
-            if pool is None:
-                raise ValueError(f"Unknown choice set: {arg1}")
-            return random.choice(pool)
-        if name == "alphanumeric":
-            if not arg1 or not arg1.isdigit():
-                raise ValueError(f"${{alphanumeric:N}} requires integer N; got: {arg1!r}")
-            n = int(arg1)
-            chars = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
-            return "".join(random.choice(chars) for _ in range(n))
-        if name == "numeric":
-            if not arg1 or not arg1.isdigit():
-                raise ValueError(f"${{numeric:N}} requires integer N; got: {arg1!r}")
-            n = int(arg1)
-            chars = "0123456789"
-            return "".join(random.choice(chars) for _ in range(n))
-        if name == "alpha":
-            if not arg1 or not arg1.isdigit():
-                raise ValueError(f"${{alpha:N}} requires integer N; got: {arg1!r}")
-            n = int(arg1)
-            chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
-            return "".join(random.choice(chars) for _ in range(n))
-        # Unknown placeholder: leave as-is to avoid data loss
-        return m.group(0)
-
-    # First, handle ${...} placeholders including ${secrets:KEY}
-    out = _PLACEHOLDER_RE.sub(repl, template)
+    # Static strings (no placeholder or inline secret) are returned without any regex pass
+    has_placeholder = "${" in template
+    if not has_placeholder and "$secrets" not in template:
+        return template
+    out = template
+    # First, handle ${...} placeholders including ${secrets:KEY}; literal slices and replacements
+    # are collected and joined once rather than calling back into Python from re.sub
+    if has_placeholder:
+        sets = sets or {}
+        parts: List[str] = []
+        pos = 0
+        for m in _PLACEHOLDER_RE.finditer(template):
+            name, arg1, arg2 = m.groups()
+            handler = _PLACEHOLDER_HANDLERS.get(name)
+            if handler is None:
+                # Unknown placeholder: leave as-is to avoid data loss
+                continue
+            parts.append(template[pos:m.start()])
+            parts.append(handler(arg1, arg2, sets, secrets, redact_secrets))
+            pos = m.end()
+        if parts:
+            parts.append(template[pos:])
+            out = "".join(parts)
 
     # Then, support inline secret syntax inside templates: "{ $secrets: KEY }"
-    try:
-        _inline = re.compile(r"\{\s*\$secrets\s*:\s*([A-Za-z0-9_\-\.]+)\s*\}")
-        def _inline_rep(m: re.Match) -> str:
-            k = m.group(1)
-            if secrets is None:
-                raise ValueError(f"Secret '{k}' requested but no --secrets file was provided")
-            if k not in secrets:
-                raise ValueError(f"Unknown secret requested: '{k}'")
-            return "***REDACTED***" if redact_secrets else str(secrets[k])
-        out = _inline.sub(_inline_rep, out)
-    except Exception:
-        # Leave as-is if replacement fails unexpectedly
-        pass
+    out = replace_inline_secrets(out, secrets, redact_secrets)
 
     return out
 
 
+# Leaf types of loaded config data; checked by exact type before the slower ABC isinstance tests
+_PRIM_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def _expand_deferred(marker: Mapping, secrets: Optional[Dict[str, str]], redact_secrets: bool) -> Any:
+    """Materialize one "$deferred" marker; unknown or malformed payloads are returned as-is."""
+    payload = marker["$deferred"]
+    if not isinstance(payload, Mapping):
+        return marker
+    func = payload.get("func")
+    if func == "timestamp":
+        fmt = payload.get("format") or payload.get("fmt") or "iso_8601"
+        return timestamp(fmt)
+    dyn = payload.get("dynamic")
+    if isinstance(dyn, Mapping):
+        template = dyn.get("template")
+        sets = dyn.get("sets") or {}
+        if not isinstance(template, str):
+            return marker
+        return dynamic_expand(template, sets, secrets=secrets, redact_secrets=redact_secrets)
+    # Unknown deferred payload: return as-is
+    return marker
+
+
 def resolve_deferred(value: Any, *, secrets: Optional[Dict[str, str]] = None, redact_secrets: bool = False) -> Any:
-    """Recursively resolve any "$deferred" function or dynamic objects.
+    """Resolve any "$deferred" function or dynamic objects in a value tree.
 
     Supported deferred marker shapes:
       {"$deferred": {"func": "timestamp", "format": "iso_8601"}}
       {"$deferred": {"dynamic": {"template": "...", "sets": {...}}}}
+
+    Containers with nothing deferred beneath them are returned as the same object rather than
+    copied, so callers must treat the result as read-only.
     """
-    if isinstance(value, Mapping):
-        if "$deferred" in value:
-            payload = value["$deferred"]
-            if not isinstance(payload, Mapping):
-                return value
-            func = payload.get("func")
-            if func == "timestamp":
-                fmt = payload.get("format") or payload.get("fmt") or "iso_8601"
-                return timestamp(fmt)
-            dyn = payload.get("dynamic")
-            if isinstance(dyn, Mapping):
-                template = dyn.get("template")
-                sets = dyn.get("sets") or {}
-                if not isinstance(template, str):
-                    return value
-                return dynamic_expand(template, sets, secrets=secrets, redact_secrets=redact_secrets)
-            # Unknown deferred payload: return as-is
+    if type(value) in _PRIM_TYPES:
+        return value
+    if isinstance(value, Mapping) and "$deferred" in value:
+        return _expand_deferred(value, secrets, redact_secrets)
+    if not isinstance(value, (Mapping, list)):
+        return value
+    # Most Headers/Body/Query trees hold no markers at all. A "$deferred" key always shows up in the
+    # repr, and building the repr in C is far cheaper than the walk below, so use it as a pre-check
+    try:
+        if "$deferred" not in repr(value):
             return value
-        # else recurse into mapping
-        return {k: resolve_deferred(v, secrets=secrets, redact_secrets=redact_secrets) for k, v in value.items()}
-    if isinstance(value, list):
-        return [resolve_deferred(v, secrets=secrets, redact_secrets=redact_secrets) for v in value]
-    return value
+    except RecursionError:
+        pass
+
+    # Iterative post-order walk. Each frame is [node, entries, next index, changed children or None];
+    # a container is rebuilt only when at least one child came back as a different object.
+    def _frame(node: Any) -> list:
+        entries = list(node.items()) if isinstance(node, Mapping) else list(enumerate(node))
+        return [node, entries, 0, None]
+
+    stack = [_frame(value)]
+    while True:
+        frame = stack[-1]
+        node, entries, i, changed = frame
+        if i < len(entries):
+            frame[2] = i + 1
+            k, child = entries[i]
+            if type(child) in _PRIM_TYPES:
+                continue
+            if isinstance(child, Mapping) and "$deferred" in child:
+                new = _expand_deferred(child, secrets, redact_secrets)
+            elif isinstance(child, (Mapping, list)):
+                stack.append(_frame(child))
+                continue
+            else:
+                continue
+        else:
+            stack.pop()
+            if changed is None:
+                new = node
+            elif isinstance(node, Mapping):
+                new = {ek: changed.get(ek, ev) for ek, ev in entries}
+            else:
+                new = list(node)
+                for idx, v in changed.items():
+                    new[idx] = v
+            if not stack:
+                return new
+            if new is node:
+                continue
+            frame = stack[-1]
+            k, child = frame[1][frame[2] - 1]
+        if new is not child:
+            if frame[3] is None:
+                frame[3] = {}
+            frame[3][k] = new
+
+
+_SECRETS_CACHE: Dict[Tuple[str, int, int], Dict[str, str]] = {}
 
 
 def load_secrets_file(path: str | Path) -> Dict[str, str]:
@@ -165,29 +296,39 @@ def load_secrets_file(path: str | Path) -> Dict[str, str]:
     - Allows values to contain any characters; leading/trailing whitespace around key and separator is trimmed, but not inside value.
     - Supports quoted values; surrounding single or double quotes are removed if present.
     - Duplicate keys: last one wins.
+
+    Results are cached per (resolved path, mtime, size), so repeated loads of an unchanged file
+    return the same dict; treat it as read-only.
     """
     p = Path(path)
     if not p.exists() or not p.is_file():
         raise FileNotFoundError(f"Secrets file not found: {p}")
+    st = p.stat()
+    cache_key = (str(p.resolve()), st.st_mtime_ns, st.st_size)
+    cached = _SECRETS_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
     secrets: Dict[str, str] = {}
-    with p.open('r', encoding='utf-8') as f:
-        for idx, raw_line in enumerate(f, start=1):
-            line = raw_line.strip()
-            if not line or line.startswith('#'):
-                continue
-            # Allow inline comments if preceded by at least one space before '#'
-            # but do not strip if '#' appears inside quotes
-            # Simple approach: split on first '='
-            if '=' not in line:
-                raise ValueError(f"Invalid secrets line {idx}: expected KEY=VALUE")
-            key, val = line.split('=', 1)
-            key = key.strip()
-            # Preserve value as-is except trim surrounding spaces
-            val = val.strip()
-            # Strip surrounding quotes if present
-            if (len(val) >= 2) and ((val[0] == val[-1]) and val[0] in ('"', "'")):
-                val = val[1:-1]
-            if not key:
-                raise ValueError(f"Invalid secrets line {idx}: empty key")
-            secrets[key] = val
+    # One read; read_text already normalizes \r\n and \r, so splitting on \n matches line iteration
+    # (unlike splitlines(), which would also break values on \x0c, \u2028 and friends)
+    for idx, raw_line in enumerate(p.read_text(encoding='utf-8').split('\n'), start=1):
+        line = raw_line.strip()
+        if not line or line[0] == '#':
+            continue
+        # Allow inline comments if preceded by at least one space before '#'
+        # but do not strip if '#' appears inside quotes
+        # Simple approach: split on first '='
+        key, sep, val = line.partition('=')
+        if not sep:
+            raise ValueError(f"Invalid secrets line {idx}: expected KEY=VALUE")
+        key = key.strip()
+        # Preserve value as-is except trim surrounding spaces
+        val = val.strip()
+        # Strip surrounding quotes if present
+        if len(val) >= 2 and val[0] == val[-1] and val[0] in ('"', "'"):
+            val = val[1:-1]
+        if not key:
+            raise ValueError(f"Invalid secrets line {idx}: empty key")
+        secrets[key] = val
+    _SECRETS_CACHE[cache_key] = secrets
     return secrets
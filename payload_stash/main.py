@@ -1,11 +1,47 @@
 import sys
+import csv
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 from datetime import datetime, timezone
+from threading import Lock
+from typing import NamedTuple
+from urllib import parse as urlparse
 import click
-import yaml
 
 from . import __version__
 from .config_schema import validate_config_path, format_validation_error, build_resolved_config_dict
+from .config_utility import load_secrets_file, resolve_deferred
+
+
+def _iso_z(dt: datetime, time_sep: str = ":") -> str:
+    """Format a UTC datetime as YYYY-MM-DDTHH:MM:SSZ (formatted directly; strftime is slower)."""
+    return (f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}T"
+            f"{dt.hour:02d}{time_sep}{dt.minute:02d}{time_sep}{dt.second:02d}Z")
+
+
+# Results CSV rows buffered in memory before being handed to csv.writer in one writerows() call
+_CSV_BATCH_ROWS = 64
+
+
+class _PreparedRequest(NamedTuple):
+    """One request of a sequence, fully resolved before the sequence starts executing."""
+    idx: int
+    r_key: str
+    method: str
+    full_url: str
+    headers_out: dict
+    data_bytes: bytes | None
+    timeout_s: float | None
+    delay_seconds: float | None
+    effective_retry: dict | None
+    resolved_request_block: dict
+    # Precomputed names and log text, so the workers do no per-request formatting of their own
+    req_name_csv: str
+    resp_stem: str
+    request_log_lines: list[str]
 
 
 @click.group(help="PayloadStash CLI")
@@ -31,7 +67,6 @@ def validate(config: Path, writeresolved: bool, secrets: Path | None):
         secrets_map = None
         if secrets is not None:
             try:
-                from .config_utility import load_secrets_file
                 secrets_map = load_secrets_file(secrets)
             except Exception as se:
                 click.echo(f"Failed to load secrets file: {se}", err=True)
@@ -47,14 +82,10 @@ def validate(config: Path, writeresolved: bool, secrets: Path | None):
         if writeresolved:
             resolved_redacted = build_resolved_config_dict(cfg, secrets=secrets_map, redact_secrets=True)
 
-            class NoAliasDumper(yaml.SafeDumper):
-                def ignore_aliases(self, data):
-                    return True
-
+            from .utility import write_yaml_file
             out_path = config.with_name(f"{config.stem}-resolved.yml")
             try:
-                with out_path.open('w', encoding='utf-8') as f:
-                    yaml.dump(resolved_redacted, f, Dumper=NoAliasDumper, sort_keys=False, allow_unicode=True)
+                write_yaml_file(out_path, resolved_redacted)
                 click.echo(f"Wrote resolved config: {out_path}")
             except Exception as we:
                 click.echo(f"Failed to write resolved config: {we}", err=True)
@@ -85,7 +116,6 @@ def run(config: Path, out_dir: Path, dry_run: bool, yes: bool, secrets: Path | N
         secrets_map = None
         if secrets is not None:
             try:
-                from .config_utility import load_secrets_file
                 secrets_map = load_secrets_file(secrets)
             except Exception as se:
                 click.echo(f"Failed to load secrets file: {se}", err=True)
@@ -99,7 +129,7 @@ def run(config: Path, out_dir: Path, dry_run: bool, yes: bool, secrets: Path | N
 
     # 3) Determine run folder
     sc_name = cfg.StashConfig.Name
-    ts = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H-%M-%SZ")
+    ts = _iso_z(datetime.now(timezone.utc), time_sep="-")
     run_root = out_dir / sc_name / ts
 
     # 4) Create directories and write resolved config into run folder
@@ -109,14 +139,13 @@ def run(config: Path, out_dir: Path, dry_run: bool, yes: bool, secrets: Path | N
         click.echo(f"Error: failed to create output directory '{run_root}': {e}", err=True)
         sys.exit(9)
 
-    class NoAliasDumper(yaml.SafeDumper):
-        def ignore_aliases(self, data):
-            return True
+    # utility pulls in PyYAML; it is imported here, once per run, so that importing the CLI
+    # (e.g. for --help) stays cheap
+    from .utility import start_run_log, write_yaml_file, yaml_to_string
 
     resolved_path = run_root / f"{config.stem}-resolved.yml"
     try:
-        with resolved_path.open('w', encoding='utf-8') as f:
-            yaml.dump(resolved_redacted, f, Dumper=NoAliasDumper, sort_keys=False, allow_unicode=True)
+        write_yaml_file(resolved_path, resolved_redacted)
     except Exception as e:
         click.echo(f"Error: failed to write resolved config: {e}", err=True)
         sys.exit(9)
@@ -141,6 +170,12 @@ def run(config: Path, out_dir: Path, dry_run: bool, yes: bool, secrets: Path | N
         click.echo("  Mode:            DRY-RUN (no HTTP calls)")
 
     # 6) User confirmation prompt
+    log_fp = None
+    csv_fp = None
+    csv_writer = None
+    csv_rows: list[list] = []
+    rm = None
+    executor = None
     try:
         if yes:
             click.echo("Auto-continue (--yes supplied).")
@@ -151,44 +186,215 @@ def run(config: Path, out_dir: Path, dry_run: bool, yes: bool, secrets: Path | N
         if resp in ("y", "yes"):
             click.echo(f"\nProcessing {sc_name}")
 
-            from .utility import start_run_log, write_log, log_yaml, write_yaml_file
-            from .config_utility import resolve_deferred
+            # Likewise deferred until a run actually starts: urllib3 (via request_manager) and the XML modules
             from .request_manager import RequestManager
-            import time
-            from urllib import parse as urlparse
-            import json
-            # Size the connection pool conservatively; concurrency is determined by config
-            pool_size = 50
+            from xml.dom import minidom as _minidom
+            # orjson is optional: when installed it serializes request bodies and pretty-prints JSON responses
+            try:
+                import orjson as _orjson
+            except ImportError:
+                _orjson = None
+            # lxml is optional as well: when installed it pretty-prints and sorts XML responses
+            try:
+                from lxml import etree as _etree
+            except ImportError:
+                _etree = None
+
+            # Size the connection pool to the busiest sequence so no worker's connection gets discarded.
+            # Sequences run one after another; a Concurrent one uses at most ConcurrencyLimit workers
+            # (8 when unset, see _effective_workers) and never more than it has requests.
+            peak_workers = max(
+                (min(s.ConcurrencyLimit or 8, len(s.Requests)) for s in sequences if s.Type == "Concurrent"),
+                default=1,
+            )
+            pool_size = max(10, peak_workers)
             rm = RequestManager(pool_maxsize=pool_size)
 
             start_run_log(log_path, ts, sc_name, resolved_path)
 
+            # Keep the run log open with a large buffer for the rest of the run instead of reopening it per
+            # message; writes from worker threads are serialized by log_lock, and it is flushed per sequence
+            log_fp = log_path.open('a', encoding='utf-8', buffering=1 << 16)
+            log_lock = Lock()
+
+            def _body_bytes(obj) -> bytes:
+                if _orjson is not None:
+                    try:
+                        return _orjson.dumps(obj)
+                    except TypeError:
+                        # e.g. integers beyond 64 bits; the stdlib encoder handles those
+                        pass
+                return json.dumps(obj).encode('utf-8')
+
+            # Response file extension from Content-Type: the subtype of the media type ("json" for
+            # "application/json; charset=utf-8"), "txt" when absent. Servers send a handful of distinct
+            # values, so the mapping is memoized per full header value.
+            ct_ext_cache: dict[str, str] = {}
+
+            def _content_type(resp_headers: dict | None) -> str | None:
+                if not resp_headers:
+                    return None
+                # Try the usual spellings directly before scanning for another casing
+                hv = resp_headers.get('Content-Type')
+                if hv is None:
+                    hv = resp_headers.get('content-type')
+                if hv is None:
+                    for hk, v in resp_headers.items():
+                        if str(hk).lower() == 'content-type':
+                            hv = v
+                            break
+                return None if hv is None else str(hv)
+
+            def _response_ext(ct_value: str | None) -> str:
+                if not ct_value:
+                    return 'txt'
+                ext = ct_ext_cache.get(ct_value)
+                if ext is None:
+                    ext = 'txt'
+                    ct_main = ct_value.split(';', 1)[0].strip()
+                    if '/' in ct_main:
+                        subtype = ct_main.split('/', 1)[1].strip()
+                        if subtype:
+                            ext = subtype.lower()
+                    ct_ext_cache[ct_value] = ext
+                return ext
+
+            if _etree is not None:
+                def _xml_prefixed(el, name: str) -> str:
+                    # lxml reports "{uri}local"; map it back to "prefix:local" using the element's namespaces
+                    if not name.startswith('{'):
+                        return name
+                    uri, local = name[1:].split('}', 1)
+                    if uri == 'http://www.w3.org/XML/1998/namespace':
+                        return 'xml:' + local
+                    for prefix, ns in el.nsmap.items():
+                        if ns == uri:
+                            return f"{prefix}:{local}" if prefix else local
+                    return local
+
+            # Optional pretty-print / sort based on Response settings and content-type
+            def _maybe_format_response(text_in: str, content_type: str | None, resp_cfg: dict | None) -> str:
+                try:
+                    if not isinstance(resp_cfg, dict) or not resp_cfg:
+                        return text_in
+                    sort_flag = bool(resp_cfg.get("Sort"))
+                    pretty_flag = bool(resp_cfg.get("PrettyPrint")) or sort_flag
+                    if not pretty_flag:
+                        return text_in
+                    ct_main = None
+                    if isinstance(content_type, str) and content_type:
+                        ct_main = content_type.split(';', 1)[0].strip().lower()
+                    # JSON handling
+                    if ct_main and (ct_main.endswith('/json') or ct_main == 'application/json'):
+                        # Same 2-space layout either way; orjson when installed, else the stdlib
+                        if _orjson is not None:
+                            try:
+                                opts = _orjson.OPT_INDENT_2 | (_orjson.OPT_SORT_KEYS if sort_flag else 0)
+                                return _orjson.dumps(_orjson.loads(text_in), option=opts).decode('utf-8') + "\n"
+                            except Exception:
+                                pass
+                        try:
+                            obj = json.loads(text_in)
+                            return json.dumps(obj, indent=2, sort_keys=sort_flag, ensure_ascii=False) + "\n"
+                        except Exception:
+                            return text_in
+                    # XML handling
+                    if ct_main and (ct_main in ('application/xml', 'text/xml') or ct_main.endswith('+xml')):
+                        # lxml sorts and pretty-prints in C when installed; minidom below is the fallback
+                        if _etree is not None:
+                            try:
+                                # Response bodies are untrusted: no entity expansion (XXE), no network access,
+                                # and libxml2's default size limits (huge_tree stays off)
+                                root = _etree.fromstring(text_in.encode('utf-8'), parser=_etree.XMLParser(remove_blank_text=True, resolve_entities=False, no_network=True))
+                                if sort_flag:
+                                    # Same rules as sort_node: attributes by name, element children by tag
+                                    # (stable, other nodes such as comments after the elements), at every level.
+                                    # Names are compared as written ("prefix:local"), which is what minidom sees
+                                    for el in root.iter(_etree.Element):
+                                        if el.attrib:
+                                            attrs = sorted(el.attrib.items(), key=lambda kv: _xml_prefixed(el, kv[0]))
+                                            el.attrib.clear()
+                                            el.attrib.update(attrs)
+                                        if len(el):
+                                            el[:] = sorted(el, key=lambda c: (not isinstance(c.tag, str), _xml_prefixed(c, c.tag) if isinstance(c.tag, str) else ""))
+                                # Same declaration line as minidom's toprettyxml()
+                                return '<?xml version="1.0" ?>\n' + _etree.tostring(root, pretty_print=True, encoding='unicode')
+                            except Exception:
+                                pass
+                        try:
+                            dom = _minidom.parseString(text_in.encode('utf-8'))
+                            if bool(resp_cfg.get("Sort")):
+                                # Sort attributes and child elements by tag name (simple, shallow sort)
+                                def sort_node(node):
+                                    try:
+                                        if node.nodeType == node.ELEMENT_NODE:
+                                            # sort attributes
+                                            if node.hasAttributes():
+                                                attrs = node.attributes
+                                                names = sorted([attrs.item(i).name for i in range(attrs.length)])
+                                                # rebuild attribute order by cloning
+                                                for n in names:
+                                                    v = attrs.get(n).value
+                                                    attrs.removeNamedItem(n)
+                                                    attrs.setNamedItem(node.ownerDocument.createAttribute(n))
+                                                    attrs.get(n).value = v
+                                            # sort children: elements by tagName; recurse
+                                            children = [c for c in node.childNodes]
+                                            for c in children:
+                                                sort_node(c)
+                                            # reorder element children
+                                            elems = [c for c in node.childNodes if c.nodeType == c.ELEMENT_NODE]
+                                            others = [c for c in node.childNodes if c.nodeType != c.ELEMENT_NODE]
+                                            elems_sorted = sorted(elems, key=lambda e: e.tagName)
+                                            # Remove all children then append in new order preserving non-elements order
+                                            for c in list(node.childNodes):
+                                                node.removeChild(c)
+                                            for e in elems_sorted:
+                                                node.appendChild(e)
+                                            for o in others:
+                                                node.appendChild(o)
+                                    except Exception:
+                                        pass
+                                sort_node(dom.documentElement)
+                            pretty_xml = dom.toprettyxml(indent="  ")
+                            # minidom adds xml declaration; keep as-is
+                            return pretty_xml
+                        except Exception:
+                            return text_in
+                    return text_in
+                except Exception:
+                    return text_in
+
             # Logging helpers with secret redaction
+            # All secret values are compiled into one alternation so each string is scanned once;
+            # longer secrets come first to avoid partial overlaps causing leakage
+            _redact_re = None
+            if secrets_map:
+                _secret_vals = sorted({str(v) for v in secrets_map.values() if v}, key=len, reverse=True)
+                if _secret_vals:
+                    _redact_re = re.compile("|".join(map(re.escape, _secret_vals)))
+
             def _redact_text(s: str) -> str:
-                if not secrets_map or not isinstance(s, str):
+                if _redact_re is None or not isinstance(s, str):
                     return s
-                out = s
-                try:
-                    # Replace longer secrets first to avoid partial overlaps causing leakage
-                    for _k, _v in sorted(secrets_map.items(), key=lambda kv: len(str(kv[1] or "")), reverse=True):
-                        if _v:
-                            out = out.replace(str(_v), "***REDACTED***")
-                except Exception:
-                    pass
-                return out
+                return _redact_re.sub("***REDACTED***", s)
 
             def _log_redacted(message: str) -> None:
                 try:
-                    write_log(log_path, _redact_text(message))
+                    text = _redact_text(message)
                 except Exception:
-                    write_log(log_path, message)
-
-            # Initialize results CSV with header
+                    text = message
+                if not text.endswith("\n"):
+                    text += "\n"
+                with log_lock:
+                    log_fp.write(text)
+
+            # Initialize results CSV with header; the writer stays open for the run. Rows are collected
+            # in csv_rows under csv_lock and written in batches of _CSV_BATCH_ROWS and at each sequence boundary
             try:
-                import csv
-                with results_csv_path.open('w', encoding='utf-8', newline='') as cf:
-                    w = csv.writer(cf)
-                    w.writerow(["sequence", "request", "timestamp", "status", "duration_ms", "attempts"])
+                csv_fp = results_csv_path.open('w', encoding='utf-8', newline='', buffering=1 << 15)
+                csv_writer = csv.writer(csv_fp)
+                csv_writer.writerow(["sequence", "request", "timestamp", "status", "duration_ms", "attempts"])
             except Exception as e:
                 _log_redacted(f"Warning: failed to initialize results CSV '{results_csv_path}': {e}")
 
@@ -196,6 +402,9 @@ def run(config: Path, out_dir: Path, dry_run: bool, yes: bool, secrets: Path | N
             sc_resolved = resolved_actual.get("StashConfig", {})
             defaults_resolved = sc_resolved.get("Defaults", {})
             url_root: str = defaults_resolved.get("URLRoot") or ""
+            # URLRoot is the same for every request; normalize it once for URL building
+            url_base = url_root.rstrip('/')
+            url_base_has_query = '?' in url_base
             flow_cfg_defaults = (defaults_resolved.get("FlowControl") or {})
             default_delay = flow_cfg_defaults.get("DelaySeconds")
             default_timeout = flow_cfg_defaults.get("TimeoutSeconds")
@@ -205,38 +414,51 @@ def run(config: Path, out_dir: Path, dry_run: bool, yes: bool, secrets: Path | N
 
             seq_dicts = sc_resolved.get("Sequences", [])
             total_seq = len(seq_dicts)
-            from threading import Lock
             csv_lock = Lock()
-            import csv as _csv
+            # Rendered "Resolved Retry" log lines keyed by id() of the retry dict; those dicts live in
+            # resolved_actual for the whole run, so the ids stay valid
+            retry_yaml_cache: dict[int, list[str]] = {}
 
             # Helper to redact any occurrences of secret values in strings within a nested structure
+            # Copy-on-write: containers are copied only along paths where a string actually changed, so
+            # secret-free structures come back as the same objects. Inputs are never mutated, as they are
+            # shared with resolved_actual (and across requests inheriting Defaults/Forced).
             def _redact_struct(obj):
-                if not secrets_map:
+                if _redact_re is None:
                     return obj
-                def repl_str(s: str) -> str:
-                    out = s
-                    try:
-                        for _k, _v in secrets_map.items():
-                            if _v:
-                                out = out.replace(str(_v), "***REDACTED***")
-                    except Exception:
-                        pass
-                    return out
                 if isinstance(obj, dict):
-                    return {k: _redact_struct(v) for k, v in obj.items()}
+                    out = None
+                    for k, v in obj.items():
+                        nv = _redact_struct(v)
+                        if nv is not v:
+                            if out is None:
+                                out = dict(obj)
+                            out[k] = nv
+                    return obj if out is None else out
                 if isinstance(obj, list):
-                    return [_redact_struct(v) for v in obj]
+                    out = None
+                    for n, v in enumerate(obj):
+                        nv = _redact_struct(v)
+                        if nv is not v:
+                            if out is None:
+                                out = list(obj)
+                            out[n] = nv
+                    return obj if out is None else out
                 if isinstance(obj, str):
-                    return repl_str(obj)
+                    # re.sub hands back the same str when nothing matched
+                    return _redact_re.sub("***REDACTED***", obj)
                 return obj
 
 
             def _append_result_row(seq_name: str, req_name: str, ts_iso: str, status_code: int, duration_ms: int, attempts: int) -> None:
                 try:
+                    if csv_writer is None:
+                        raise RuntimeError("results CSV is not open")
                     with csv_lock:
-                        with results_csv_path.open('a', encoding='utf-8', newline='') as cf:
-                            w = _csv.writer(cf)
-                            w.writerow([seq_name, req_name, ts_iso, status_code, duration_ms, attempts])
+                        csv_rows.append([seq_name, req_name, ts_iso, status_code, duration_ms, attempts])
+                        if len(csv_rows) >= _CSV_BATCH_ROWS:
+                            csv_writer.writerows(csv_rows)
+                            csv_rows.clear()
                 except Exception as e:
                     _log_redacted(f"Warning: failed to append to results CSV: {e}")
 
@@ -261,8 +483,7 @@ def run(config: Path, out_dir: Path, dry_run: bool, yes: bool, secrets: Path | N
 
                 # Prepare all requests for this sequence (resolve and persist to resolved file)
                 req_items = seq_d.get("Requests", [])
-                prepared_requests: list[tuple[int, str, dict, dict, str, dict, bytes | None, float | None, dict | None]] = []
-                # Each tuple: (index, r_key, resolved_request_block, headers_out, full_url, r_val, data_bytes, timeout_s, effective_retry)
+                prepared_requests: list[_PreparedRequest] = []
                 for j, req_item in enumerate(req_items, start=1):
                     if not isinstance(req_item, dict) or len(req_item) != 1:
                         _log_redacted(f"  Skipping malformed request at index {j}")
@@ -284,42 +505,35 @@ def run(config: Path, out_dir: Path, dry_run: bool, yes: bool, secrets: Path | N
                     body_res = resolve_deferred(body, secrets=secrets_map) if body is not None else None
                     query_res = resolve_deferred(query, secrets=secrets_map) if query is not None else None
 
-                    # Update resolved dicts with URLRoot and resolved sections
-                    try:
-                        resolved_actual["StashConfig"]["Sequences"][i-1]["Requests"][j-1][r_key]["URLRoot"] = url_root
-                        resolved_redacted["StashConfig"]["Sequences"][i-1]["Requests"][j-1][r_key]["URLRoot"] = url_root
-                    except Exception:
-                        pass
+                    # Update resolved dicts with URLRoot and resolved sections.
+                    # r_val is already this request's block in resolved_actual; look up its redacted twin once
+                    rr_val = resolved_redacted["StashConfig"]["Sequences"][i-1]["Requests"][j-1][r_key]
+                    r_val["URLRoot"] = url_root
+                    rr_val["URLRoot"] = url_root
+                    headers_red = body_red = query_red = None
                     if headers_res is not None:
-                        resolved_actual["StashConfig"]["Sequences"][i-1]["Requests"][j-1][r_key]["Headers"] = headers_res
-                        resolved_redacted["StashConfig"]["Sequences"][i-1]["Requests"][j-1][r_key]["Headers"] = _redact_struct(headers_res)
+                        r_val["Headers"] = headers_res
+                        rr_val["Headers"] = headers_red = _redact_struct(headers_res)
                     if body_res is not None:
-                        resolved_actual["StashConfig"]["Sequences"][i-1]["Requests"][j-1][r_key]["Body"] = body_res
-                        resolved_redacted["StashConfig"]["Sequences"][i-1]["Requests"][j-1][r_key]["Body"] = _redact_struct(body_res)
+                        r_val["Body"] = body_res
+                        rr_val["Body"] = body_red = _redact_struct(body_res)
                     if query_res is not None:
-                        resolved_actual["StashConfig"]["Sequences"][i-1]["Requests"][j-1][r_key]["Query"] = query_res
-                        resolved_redacted["StashConfig"]["Sequences"][i-1]["Requests"][j-1][r_key]["Query"] = _redact_struct(query_res)
-
-                    # Overwrite the resolved file on disk after resolving this request
-                    try:
-                        write_yaml_file(resolved_path, resolved_redacted)
-                    except Exception as we:
-                        _log_redacted(f"  Warning: failed to update resolved file after {r_key}: {we}")
+                        r_val["Query"] = query_res
+                        rr_val["Query"] = query_red = _redact_struct(query_res)
 
                     # Build URL
-                    base = (url_root or "").rstrip('/')
                     path = (url_path or "").lstrip('/')
-                    full_url = base + ("/" if path else "") + path
+                    full_url = url_base + ("/" if path else "") + path
                     if query_res:
                         qparts = urlparse.urlencode(query_res, doseq=True, safe="/:?")
-                        sep = '&' if ('?' in full_url) else '?'
+                        sep = '&' if (url_base_has_query or '?' in path) else '?'
                         full_url = f"{full_url}{sep}{qparts}"
 
                     # Prepare body
                     data_bytes = None
                     if body_res is not None:
                         try:
-                            data_bytes = json.dumps(body_res).encode('utf-8')
+                            data_bytes = _body_bytes(body_res)
                         except Exception:
                             data_bytes = str(body_res).encode('utf-8')
 
@@ -327,7 +541,7 @@ def run(config: Path, out_dir: Path, dry_run: bool, yes: bool, secrets: Path | N
                     headers_out = {}
                     if isinstance(headers_res, dict):
                         headers_out.update(headers_res)
-                    if data_bytes is not None and not any(h.lower() == 'content-type' for h in headers_out.keys()):
+                    if data_bytes is not None and 'content-type' not in {str(h).lower() for h in headers_out}:
                         headers_out['Content-Type'] = 'application/json; charset=utf-8'
 
                     # Effective Retry (already precedence-resolved in resolved config building)
@@ -367,40 +581,65 @@ def run(config: Path, out_dir: Path, dry_run: bool, yes: bool, secrets: Path | N
                     }
                     if response_opts is not None:
                         resolved_request_block["Response"] = response_opts
-
-                    prepared_requests.append((j, r_key, resolved_request_block, headers_out, full_url, r_val, data_bytes, timeout_s, effective_retry))
+                    # Render the logged (redacted) request now, reusing the sections already redacted above
+                    redacted_request_block = dict(resolved_request_block, Method=_redact_text(method), URLRoot=_redact_text(url_root),
+                                                  URLPath=_redact_text(url_path), Headers=headers_red, Body=body_red, Query=query_red)
+                    request_log_lines = ["      " + ln for ln in yaml_to_string(redacted_request_block).splitlines()]
+
+                    prepared_requests.append(_PreparedRequest(
+                        idx=j,
+                        r_key=r_key,
+                        method=method,
+                        full_url=full_url,
+                        headers_out=headers_out,
+                        data_bytes=data_bytes,
+                        timeout_s=timeout_s,
+                        delay_seconds=delay_seconds,
+                        effective_retry=effective_retry,
+                        resolved_request_block=resolved_request_block,
+                        req_name_csv=f"req{j:03d}-{r_key}",
+                        resp_stem=f"req{j:03d}-{r_key}-response",
+                        request_log_lines=request_log_lines,
+                    ))
+
+                # Overwrite the resolved file on disk once per sequence, now that its requests are resolved;
+                # re-dumping the whole document after every request made this quadratic in the request count
+                try:
+                    write_yaml_file(resolved_path, resolved_redacted)
+                except Exception as we:
+                    _log_redacted(f"  Warning: failed to update resolved file after sequence {s_name}: {we}")
 
                 # Helper to format and execute a single request, returning grouped log lines
-                from .utility import yaml_to_string
-                import json as _json
 
-                def _process_single_request(idx: int, total_in_seq: int, r_key: str,
-                                            method: str, full_url: str, headers_out: dict, data_bytes: bytes | None,
-                                            timeout_s: float | None, effective_retry: dict | None,
-                                            resolved_request_block: dict) -> tuple[int, list[str]]:
+                seq_name_csv = seq_dir_name
+
+                def _process_single_request(p: _PreparedRequest, total_in_seq: int) -> tuple[int, list[str]]:
+                    idx, r_key, req_name_csv, effective_retry = p.idx, p.r_key, p.req_name_csv, p.effective_retry
+                    resolved_request_block = p.resolved_request_block
                     lines: list[str] = []
                     try:
                         click.echo(f"Running request {idx}/{total_in_seq}: {r_key}")
                     except Exception:
                         pass
                     lines.append(f"  Request {idx}/{total_in_seq}: {r_key}")
-                    lines.append(f"    URL: {_redact_text(full_url)}")
+                    lines.append(f"    URL: {_redact_text(p.full_url)}")
                     # Capture start timestamp (UTC, ISO8601 Z) and log it
-                    start_iso = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+                    start_iso = _iso_z(datetime.now(timezone.utc))
                     lines.append(f"    Start: {start_iso}")
-                    seq_name_csv = f"{seq_dir_name}"
-                    req_name_csv = f"req{idx:03d}-{r_key}"
                     # Log Resolved Request
-                    y_req = yaml_to_string(_redact_struct(resolved_request_block)).splitlines()
                     lines.append("    Resolved Request:")
-                    lines.extend(["      " + ln for ln in y_req])
+                    lines.extend(p.request_log_lines)
                     # Resolved Retry
                     if effective_retry is None:
                         lines.append("    Resolved Retry: Null")
                     else:
-                        y_ret = yaml_to_string(effective_retry).splitlines()
+                        # Requests inheriting Defaults.Retry share one dict; render its YAML once per run
+                        y_ret = retry_yaml_cache.get(id(effective_retry))
+                        if y_ret is None:
+                            y_ret = ["      " + ln for ln in yaml_to_string(effective_retry).splitlines()]
+                            retry_yaml_cache[id(effective_retry)] = y_ret
                         lines.append("    Resolved Retry:")
-                        lines.extend(["      " + ln for ln in y_ret])
+                        lines.extend(y_ret)
 
                     if dry_run:
                         lines.append("    DRY-RUN: would make request (skipped)")
@@ -414,12 +653,12 @@ def run(config: Path, out_dir: Path, dry_run: bool, yes: bool, secrets: Path | N
                     # Execute request
                     try:
                         t0 = time.perf_counter()
-                        status, resp_headers, resp_text, attempts_made, req_log = rm.request(
-                            method=method,
-                            url=full_url,
-                            headers=headers_out,
-                            body=data_bytes,
-                            timeout_s=timeout_s,
+                        status, resp_headers, resp_body, attempts_made, req_log = rm.request(
+                            method=p.method,
+                            url=p.full_url,
+                            headers=p.headers_out,
+                            body=p.data_bytes,
+                            timeout_s=p.timeout_s,
                             retry_cfg=effective_retry,
                             insecure_tls=bool(resolved_request_block.get("InsecureTLS") or False),
                         )
@@ -434,112 +673,26 @@ def run(config: Path, out_dir: Path, dry_run: bool, yes: bool, secrets: Path | N
                         lines.extend(["      " + ln for ln in y_hdr])
                         # Write body to file
                         try:
-                            ct_value = None
-                            for hk, hv in (resp_headers or {}).items():
-                                try:
-                                    if str(hk).lower() == 'content-type':
-                                        ct_value = str(hv)
-                                        break
-                                except Exception:
-                                    continue
-                            ext = 'txt'
-                            if isinstance(ct_value, str) and ct_value:
-                                try:
-                                    ct_main = ct_value.split(';', 1)[0].strip()
-                                    if '/' in ct_main:
-                                        subtype = ct_main.split('/', 1)[1].strip()
-                                        if subtype:
-                                            ext = subtype.lower()
-                                except Exception:
-                                    pass
-
-                            # Optional pretty-print / sort based on Response settings and content-type
-                            def _maybe_format_response(text_in: str, content_type: str | None, resp_cfg: dict | None) -> str:
-                                try:
-                                    if not isinstance(resp_cfg, dict) or not resp_cfg:
-                                        return text_in
-                                    sort_flag = bool(resp_cfg.get("Sort"))
-                                    pretty_flag = bool(resp_cfg.get("PrettyPrint")) or sort_flag
-                                    if not pretty_flag:
-                                        return text_in
-                                    ct_main = None
-                                    if isinstance(content_type, str) and content_type:
-                                        ct_main = content_type.split(';', 1)[0].strip().lower()
-                                    # JSON handling
-                                    if ct_main and (ct_main.endswith('/json') or ct_main == 'application/json'):
-                                        try:
-                                            from rich.console import Console
-                                            from rich.json import JSON as RichJSON
-                                            import io as _io
-                                            # If sort requested, we need to ensure keys are sorted; RichJSON supports sort_keys
-                                            s = _io.StringIO()
-                                            console = Console(file=s, no_color=True, force_jupyter=False, force_terminal=False, color_system=None, width=120)
-                                            # RichJSON can take a JSON string directly
-                                            rj = RichJSON(text_in, indent=2, sort_keys=sort_flag)
-                                            console.print(rj)
-                                            return s.getvalue().rstrip() + "\n"
-                                        except Exception:
-                                            # Fallback to standard formatting
-                                            import json as _json2
-                                            try:
-                                                obj = _json2.loads(text_in)
-                                                return _json2.dumps(obj, indent=2, sort_keys=sort_flag, ensure_ascii=False) + "\n"
-                                            except Exception:
-                                                return text_in
-                                    # XML handling
-                                    if ct_main and (ct_main in ('application/xml', 'text/xml') or ct_main.endswith('+xml')):
-                                        try:
-                                            from xml.dom import minidom as _minidom
-                                            dom = _minidom.parseString(text_in.encode('utf-8'))
-                                            if bool(resp_cfg.get("Sort")):
-                                                # Sort attributes and child elements by tag name (simple, shallow sort)
-                                                def sort_node(node):
-                                                    try:
-                                                        if node.nodeType == node.ELEMENT_NODE:
-                                                            # sort attributes
-                                                            if node.hasAttributes():
-                                                                attrs = node.attributes
-                                                                names = sorted([attrs.item(i).name for i in range(attrs.length)])
-                                                                # rebuild attribute order by cloning
-                                                                for n in names:
-                                                                    v = attrs.get(n).value
-                                                                    attrs.removeNamedItem(n)
-                                                                    attrs.setNamedItem(node.ownerDocument.createAttribute(n))
-                                                                    attrs.get(n).value = v
-                                                            # sort children: elements by tagName; recurse
-                                                            children = [c for c in node.childNodes]
-                                                            for c in children:
-                                                                sort_node(c)
-                                                            # reorder element children
-                                                            elems = [c for c in node.childNodes if c.nodeType == c.ELEMENT_NODE]
-                                                            others = [c for c in node.childNodes if c.nodeType != c.ELEMENT_NODE]
-                                                            elems_sorted = sorted(elems, key=lambda e: e.tagName)
-                                                            # Remove all children then append in new order preserving non-elements order
-                                                            for c in list(node.childNodes):
-                                                                node.removeChild(c)
-                                                            for e in elems_sorted:
-                                                                node.appendChild(e)
-                                                            for o in others:
-                                                                node.appendChild(o)
-                                                    except Exception:
-                                                        pass
-                                                sort_node(dom.documentElement)
-                                            pretty_xml = dom.toprettyxml(indent="  ")
-                                            # minidom adds xml declaration; keep as-is
-                                            return pretty_xml
-                                        except Exception:
-                                            return text_in
-                                    return text_in
-                                except Exception:
-                                    return text_in
-
-                            resp_out_name = f"req{idx:03d}-{r_key}-response.{ext}"
-                            resp_out_path = seq_out_dir / resp_out_name
+                            ct_value = _content_type(resp_headers)
+                            ext = _response_ext(ct_value)
+
+                            resp_out_path = seq_out_dir / f"{p.resp_stem}.{ext}"
                             # Derive Response config from resolved request block
                             resp_cfg = resolved_request_block.get("Response") if isinstance(resolved_request_block, dict) else None
-                            text_to_write = _maybe_format_response(resp_text, ct_value, resp_cfg)
-                            with resp_out_path.open('w', encoding='utf-8') as rf:
-                                rf.write(text_to_write)
+                            # Bodies are written as received; only a PrettyPrint/Sort request that actually
+                            # reformats the content goes through a decode/format/encode round-trip
+                            text_to_write = None
+                            if isinstance(resp_cfg, dict) and (resp_cfg.get("PrettyPrint") or resp_cfg.get("Sort")):
+                                resp_text = resp_body.decode("utf-8", errors="replace")
+                                formatted = _maybe_format_response(resp_text, ct_value, resp_cfg)
+                                if formatted is not resp_text:
+                                    text_to_write = formatted
+                            if text_to_write is None:
+                                with resp_out_path.open('wb') as rf:
+                                    rf.write(resp_body)
+                            else:
+                                with resp_out_path.open('w', encoding='utf-8') as rf:
+                                    rf.write(text_to_write)
                             lines.append(f"    Response Body: written to {resp_out_path}")
                         except Exception as we:
                             lines.append(f"    Warning: failed to write response body file: {we}")
@@ -552,28 +705,21 @@ def run(config: Path, out_dir: Path, dry_run: bool, yes: bool, secrets: Path | N
                             pass
                     except Exception as he:
                         # Any internal request logs captured by RequestManager on error
-                        try:
-                            req_log = getattr(he, "request_log", None)
-                        except Exception:
-                            req_log = None
+                        req_log = getattr(he, "request_log", None)
                         if req_log:
                             for line in str(req_log).splitlines():
                                 lines.append("    " + line)
                         lines.append(f"    ERROR: Request failed: {he}")
-                        # Record failure to CSV (-1 status)
-                        try:
-                            t1 = time.perf_counter()
-                            duration_ms = int(round((t1 - t0) * 1000))
-                            attempts_fail = getattr(he, "attempts_made", 1)
-                            _append_result_row(seq_name_csv, req_name_csv, start_iso, -1, duration_ms, int(attempts_fail) if isinstance(attempts_fail, (int, float)) else 1)
-                        except Exception:
-                            pass
+                        # Record failure to CSV (-1 status); _append_result_row reports its own errors
+                        duration_ms = int(round((time.perf_counter() - t0) * 1000))
+                        attempts_fail = getattr(he, "attempts_made", 1)
+                        attempts_fail = int(attempts_fail) if isinstance(attempts_fail, (int, float)) else 1
+                        _append_result_row(seq_name_csv, req_name_csv, start_iso, -1, duration_ms, attempts_fail)
                     return idx, lines
 
                 # Execute sequentially or concurrently
                 s_type = (seq_d.get("Type") or "Sequential").strip()
                 total_in_seq = len(prepared_requests)
-                from concurrent.futures import ThreadPoolExecutor, as_completed
 
                 # Determine workers for concurrent type
                 conc_limit = seq_d.get("ConcurrencyLimit")
@@ -589,46 +735,72 @@ def run(config: Path, out_dir: Path, dry_run: bool, yes: bool, secrets: Path | N
                         return min(8, max(1, total_in_seq))
                     return max(1, min(cap, total_in_seq))
 
-                if s_type.lower() == "concurrent":
+                is_concurrent = s_type.lower() == "concurrent"
+                workers = 1
+                if is_concurrent:
                     workers = _effective_workers()
                     _log_redacted(f"  Using concurrency: workers={workers}")
-                    outcomes: dict[int, list[str]] = {}
-                    next_to_flush = 1
-                    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"seq{i:03d}") as ex:
-                        futs = []
-                        for (idx, r_key, resolved_request_block, headers_out, full_url, r_val, data_bytes, timeout_s, effective_retry) in prepared_requests:
-                            method = (r_val.get("Method") or "").upper()
-                            fut = ex.submit(_process_single_request, idx, total_in_seq, r_key, method, full_url, headers_out, data_bytes, timeout_s, effective_retry, resolved_request_block)
+                if is_concurrent and workers > 1:
+                    # One executor (sized to the busiest sequence) serves the whole run; this sequence's
+                    # limit is enforced by keeping at most `workers` of its requests in flight
+                    if executor is None:
+                        executor = ThreadPoolExecutor(max_workers=peak_workers, thread_name_prefix="payloadstash")
+                    # futs is in request order; results are logged from its head as soon as they are done
+                    futs = [executor.submit(_process_single_request, p, total_in_seq) for p in prepared_requests[:workers]]
+                    in_flight = set(futs)
+                    next_to_flush = 0
+                    while in_flight:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for p in prepared_requests[len(futs):len(futs) + len(done)]:
+                            fut = executor.submit(_process_single_request, p, total_in_seq)
                             futs.append(fut)
-                        for fut in as_completed(futs):
-                            idx, lines = fut.result()
-                            outcomes[idx] = lines
-                            while next_to_flush in outcomes:
-                                _log_redacted("\n".join(outcomes.pop(next_to_flush)))
-                                next_to_flush += 1
+                            in_flight.add(fut)
+                        while next_to_flush < len(futs) and futs[next_to_flush].done():
+                            _, lines = futs[next_to_flush].result()
+                            _log_redacted("\n".join(lines))
+                            next_to_flush += 1
                     # No sequence-level delay per clarified semantics
+                elif is_concurrent:
+                    # A single worker gains nothing from the executor; run inline, still without delays
+                    for p in prepared_requests:
+                        _, lines = _process_single_request(p, total_in_seq)
+                        _log_redacted("\n".join(lines))
                 else:
                     # Sequential
-                    for (idx, r_key, resolved_request_block, headers_out, full_url, r_val, data_bytes, timeout_s, effective_retry) in prepared_requests:
-                        method = (r_val.get("Method") or "").upper()
-                        _, lines = _process_single_request(idx, total_in_seq, r_key, method, full_url, headers_out, data_bytes, timeout_s, effective_retry, resolved_request_block)
+                    for p in prepared_requests:
+                        _, lines = _process_single_request(p, total_in_seq)
                         _log_redacted("\n".join(lines))
-                        # Respect FlowControl delay between requests only
-                        r_flow = (r_val.get("FlowControl") or {})
-                        delay_seconds = r_flow.get("DelaySeconds", default_delay)
-                        try:
-                            _log_redacted(f"    Delay {delay_seconds if delay_seconds is not None else 0} s")
-                            if delay_seconds and delay_seconds > 0:
-                                time.sleep(delay_seconds)
-                        except Exception:
-                            pass
+                        # Respect FlowControl delay between requests only; zero/None means no pause and no log line
+                        delay_seconds = p.delay_seconds
+                        if delay_seconds and delay_seconds > 0:
+                            _log_redacted(f"    Delay {delay_seconds} s")
+                            time.sleep(delay_seconds)
                 # No delay when advancing to next sequence per clarified semantics
+                with log_lock:
+                    log_fp.flush()
+                if csv_writer is not None:
+                    with csv_lock:
+                        csv_writer.writerows(csv_rows)
+                        csv_rows.clear()
+                        csv_fp.flush()
 
             _log_redacted("=== PayloadStash run finished ===")
         else:
             click.echo("\nOperation Cancelled")
     except Exception:
         click.echo("\nOperation Cancelled")
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        if rm is not None:
+            rm.close()
+        if log_fp is not None:
+            log_fp.close()
+        if csv_fp is not None:
+            if csv_writer is not None and csv_rows:
+                # Rows of a sequence interrupted before its boundary
+                csv_writer.writerows(csv_rows)
+            csv_fp.close()
 
     sys.exit(0)
 
@@ -9,7 +9,7 @@ Design:
   to match the config schema.
 
 This module exposes a RequestManager class with a simple `request` method,
-returning (status_code, headers_dict, response_text).
+returning (status_code, headers_dict, response_body) with the body as raw bytes.
 """
 from __future__ import annotations
 
@@ -64,6 +64,18 @@ class RequestManager:
             # Fallback: if SSL context creation fails, reuse secure pool (verification will be on)
             self._pool_insecure = self._pool_secure
 
+    def close(self) -> None:
+        """Close every pooled connection. The manager should not be used afterwards."""
+        self._pool_secure.clear()
+        if self._pool_insecure is not self._pool_secure:
+            self._pool_insecure.clear()
+
+    def __enter__(self) -> "RequestManager":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def _single_attempt(
         self,
         method: str,
@@ -72,7 +84,7 @@ class RequestManager:
         body: Optional[bytes],
         timeout_s: Optional[float],
         insecure_tls: bool = False,
-    ) -> Tuple[int, Dict[str, str], str]:
+    ) -> Tuple[int, Dict[str, str], bytes]:
         timeout = None
         if isinstance(timeout_s, (int, float)) and timeout_s > 0:
             timeout = urllib3.Timeout(total=float(timeout_s))
@@ -90,12 +102,9 @@ class RequestManager:
             status = int(resp.status)
             # headers: HTTPHeaderDict -> convert to plain dict (last value wins)
             resp_headers = {k: v for k, v in resp.headers.items()}
+            # Raw bytes; callers decode only when they need text (e.g. pretty-printing)
             data = resp.read() or b""
-            try:
-                text = data.decode("utf-8", errors="replace")
-            except Exception:
-                text = str(data)
-            return status, resp_headers, text
+            return status, resp_headers, data
         finally:
             try:
                 resp.close()
@@ -134,11 +143,11 @@ class RequestManager:
         timeout_s: Optional[float] = None,
         retry_cfg: Optional[Dict[str, Any]] = None,
         insecure_tls: bool = False,
-    ) -> Tuple[int, Dict[str, str], str, int, str]:
+    ) -> Tuple[int, Dict[str, str], bytes, int, str]:
         """
         Perform an HTTP request with schema-driven retries and backoff.
 
-        Returns a tuple: (status_code, headers_dict, response_text, attempts_made, request_log)
+        Returns a tuple: (status_code, headers_dict, response_body, attempts_made, request_log)
         where `request_log` is a multi-line string containing any retry/backoff notes.
         """
         log_lines: list[str] = []
@@ -171,11 +180,11 @@ class RequestManager:
         last_exc: Optional[BaseException] = None
         status: int = -1
         resp_headers: Dict[str, str] = {}
-        resp_text: str = ""
+        resp_body: bytes = b""
 
         for attempt in range(1, attempts + 1):
             try:
-                status, resp_headers, resp_text = self._single_attempt(method, url, headers, body, timeout_s, insecure_tls)
+                status, resp_headers, resp_body = self._single_attempt(method, url, headers, body, timeout_s, insecure_tls)
                 last_exc = None
             except BaseException as e:
                 last_exc = e
@@ -217,7 +226,7 @@ class RequestManager:
                         pass
                     raise last_exc
                 # success path without retry
-                return status, resp_headers, resp_text, attempt, "\n".join(log_lines)
+                return status, resp_headers, resp_body, attempt, "\n".join(log_lines)
 
             # Compute delay for the next retry
             next_retry_index = attempt  # 1 for first retry after attempt 1
@@ -243,7 +252,7 @@ class RequestManager:
                             pass
                         raise last_exc
                     # Return the current (possibly error) response without waiting further
-                    return status, resp_headers, resp_text, attempt, "\n".join(log_lines)
+                    return status, resp_headers, resp_body, attempt, "\n".join(log_lines)
 
             if delay > 0:
                 log_lines.append(f"Retry: sleeping {delay:.3f} s before next attempt")
@@ -258,4 +267,4 @@ class RequestManager:
             except Exception:
                 pass
             raise last_exc
-        return status, resp_headers, resp_text, attempts, "\n".join(log_lines)
+        return status, resp_headers, resp_body, attempts, "\n".join(log_lines)
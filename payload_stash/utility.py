@@ -8,7 +8,11 @@ import yaml
 PathLike = Union[str, Path]
 
 
-class NoAliasDumper(yaml.SafeDumper):
+# libyaml-backed emitter when PyYAML was built with it; same representers, much faster output
+_SafeDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
+class NoAliasDumper(_SafeDumper):
     def ignore_aliases(self, data):
         return True
 